@@ -1,8 +1,564 @@
+import contextlib
+import functools
+import os
+import time
+
 import pytest
+from pages.home_page import HomePage
+from utils.artifacts import DEFAULT_ARTIFACTS_DIR, ArtifactStore
+from utils.consent import clear_consent, seed_consent
+from utils.benchmark import DEFAULT_BASELINE, DEFAULT_RESULTS, ScenarioBenchmark, is_warmup, round_id, scenario_name
 from utils.driver_factory import get_driver
+from utils.driver_pool import DriverPool
+from utils.launch_profiles import LAUNCH_PROFILES
+from utils.lever_api import fetch_postings, load_postings, posting_record, save_postings
+from utils.locator_benchmark import format_rows
+from utils.resource_governor import ResourceGovernor
+from utils.request_blocking import PROFILES, ResourceMonitor, get_profile
+from utils.site_replay import DEFAULT_CAPTURE_DIR, ReplayServer, SiteRecorder
+from utils.tracing import DEFAULT_TRACE_DIR, Tracer, trace_file_name
+from utils.web_metrics import WebMetricsCollector, parse_thresholds
+
+pytest_plugins = ["utils.parallel_runner"]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("driver pool")
+    group.addoption(
+        "--driver-pool-size",
+        type=int,
+        default=int(os.environ.get("DRIVER_POOL_SIZE", "1")),
+        help="Number of warm browsers kept ready for tests (0 starts a fresh browser per test)",
+    )
+    group.addoption(
+        "--driver-max-uses",
+        type=int,
+        default=int(os.environ.get("DRIVER_MAX_USES", "50")),
+        help="Number of tests a pooled browser serves before it is replaced",
+    )
+
+    group = parser.getgroup("resource governor")
+    group.addoption(
+        "--max-browser-rss-mb",
+        type=int,
+        default=int(os.environ.get("MAX_BROWSER_RSS_MB", "0")) or None,
+        help="Replace a browser whose process tree uses more memory than this after a test",
+    )
+    group.addoption(
+        "--max-browser-cpu-seconds",
+        type=float,
+        default=None,
+        help="Replace a browser whose process tree has used more CPU time than this",
+    )
+    group.addoption("--resource-report", metavar="PATH", help="Write every test's browser RSS and CPU deltas to PATH (JSON)")
+
+    group = parser.getgroup("site")
+    group.addoption(
+        "--site",
+        choices=["live", "record", "replay"],
+        default=os.environ.get("SITE_MODE", "live"),
+        help="Run against the live sites, record them into --capture-dir, or replay the captures locally",
+    )
+    group.addoption(
+        "--capture-dir",
+        default=DEFAULT_CAPTURE_DIR,
+        help="Directory holding the recorded pages and responses",
+    )
+
+    group.addoption(
+        "--consent",
+        choices=["seeded", "banner"],
+        default=os.environ.get("CONSENT_MODE", "seeded"),
+        help="Seed the declined cookie consent before the first navigation, or let the real cookie banner show",
+    )
+    group.addoption(
+        "--job-validation",
+        choices=["ui", "hybrid"],
+        default=os.environ.get("JOB_VALIDATION", "ui"),
+        help="Validate the job list card by card in the browser, or through the Lever API plus a sample of cards",
+    )
+
+    group = parser.getgroup("request blocking")
+    group.addoption(
+        "--blocking-profile",
+        choices=list(PROFILES),
+        default=os.environ.get("BLOCKING_PROFILE", "none"),
+        help="Requests blocked through DevTools (analytics, trackers, fonts, ...)",
+    )
+    group.addoption("--max-page-requests", type=int, help="Fail a test when a page loads more requests than this")
+    group.addoption("--max-page-bytes", type=int, help="Fail a test when a page transfers more bytes than this")
+    group.addoption(
+        "--calibrate-resource-sizes",
+        action="store_true",
+        help="Run unblocked and record the size of every loaded URL, used to estimate the bytes a profile saves",
+    )
+
+    group = parser.getgroup("launch profile")
+    group.addoption(
+        "--launch-profile",
+        choices=list(LAUNCH_PROFILES),
+        default=os.environ.get("LAUNCH_PROFILE", "default"),
+        help="Chrome launch profile for the run; a test can override it with @pytest.mark.launch_profile(name)",
+    )
+
+    group = parser.getgroup("web metrics")
+    group.addoption(
+        "--perf-report",
+        metavar="PATH",
+        help="Sample page metrics (TTFB, LCP, JS heap, ...) per page-object step and write PATH.json and PATH.csv",
+    )
+    group.addoption(
+        "--perf-threshold",
+        action="append",
+        default=[],
+        metavar="METRIC=LIMIT",
+        help="Fail a test whose page went over the limit, e.g. --perf-threshold lcp_ms=2500 (repeatable)",
+    )
+
+    group = parser.getgroup("filter matrix")
+    group.addoption(
+        "--filter-combination",
+        action="append",
+        default=[],
+        metavar="LOCATION=DEPARTMENT",
+        help="Check this combination in the filter matrix scenario instead of the ones derived "
+        "from the listed jobs, e.g. --filter-combination 'Istanbul, Turkiye=Quality Assurance' (repeatable)",
+    )
+    group.addoption(
+        "--filter-matrix-size",
+        type=int,
+        default=8,
+        help="Number of combinations derived from the listed jobs when none is given (default 8)",
+    )
+
+    group = parser.getgroup("failure artifacts")
+    group.addoption(
+        "--artifacts-dir",
+        default=DEFAULT_ARTIFACTS_DIR,
+        help="Directory for the screenshot, DOM, console and network log of failed tests",
+    )
+    group.addoption("--artifacts-max-mb", type=int, default=200, help="Size cap of the failure artifacts of a run")
+    group.addoption("--no-failure-artifacts", action="store_true", help="Do not capture artifacts of failed tests")
+
+    group = parser.getgroup("step tracing")
+    group.addoption(
+        "--step-trace",
+        choices=["off", "failures", "all"],
+        default=os.environ.get("STEP_TRACE", "off"),
+        help="Record page-object steps and WebDriver commands; export a Chrome trace for failed tests or all tests",
+    )
+    group.addoption("--step-trace-dir", default=DEFAULT_TRACE_DIR, help="Directory the trace JSON files are written to")
+
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=0,
+        help="Run every scenario this many times against the replay site and time its phases",
+    )
+    group.addoption("--benchmark-baseline", default=DEFAULT_BASELINE, help="Baseline the phase timings are compared with")
+    group.addoption("--benchmark-save", action="store_true", help="Save this run's timings as the new baseline")
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=0.2,
+        help="Fail when a phase median is slower than the baseline by more than this fraction (default 0.2)",
+    )
+    group.addoption("--benchmark-output", default=DEFAULT_RESULTS, help="File the timings of this run are written to")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "launch_profile(name): start the test's browser with this launch profile")
+    config.addinivalue_line("markers", "benchmark: benchmark-only test, run once per --benchmark-rounds run")
+    config._driver_pools = {}
+    config._governor = ResourceGovernor(
+        max_rss_mb=config.getoption("--max-browser-rss-mb"),
+        max_cpu_seconds=config.getoption("--max-browser-cpu-seconds"),
+    )
+    if config.getoption("--calibrate-resource-sizes") and get_profile(config.getoption("--blocking-profile")).is_active():
+        raise pytest.UsageError("--calibrate-resource-sizes records unblocked sizes, run it with --blocking-profile none")
+    config._web_metrics = None
+    if config.getoption("--perf-report") or config.getoption("--perf-threshold"):
+        try:
+            thresholds = parse_thresholds(config.getoption("--perf-threshold"))
+        except ValueError as error:
+            raise pytest.UsageError(str(error))
+        config._web_metrics = WebMetricsCollector(thresholds)
+    try:
+        config._filter_combinations = parse_filter_combinations(config.getoption("--filter-combination"))
+    except ValueError as error:
+        raise pytest.UsageError(str(error))
+    if config.getoption("--filter-matrix-size") < 1:
+        raise pytest.UsageError("--filter-matrix-size must be at least 1")
+    config._artifacts = None
+    if not config.getoption("--no-failure-artifacts"):
+        config._artifacts = ArtifactStore(
+            config.getoption("--artifacts-dir"),
+            max_bytes=config.getoption("--artifacts-max-mb") * 1_000_000,
+        )
+    config._tracer = Tracer() if config.getoption("--step-trace") != "off" else None
+    config._benchmark = None
+    if config.getoption("--benchmark-rounds") > 0:
+        if config.getoption("--site") != "replay":
+            raise pytest.UsageError("Benchmarks run against the local stand-in site: record it with --site record, then pass --site replay")
+        config._benchmark = ScenarioBenchmark(tolerance=config.getoption("--benchmark-tolerance"))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Keep each phase's report on the item (item.rep_setup, item.rep_call) for fixture teardown"""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+def pytest_generate_tests(metafunc):
+    """Repeat every browser scenario --benchmark-rounds times, after a warm-up round"""
+    rounds = metafunc.config.getoption("--benchmark-rounds")
+    if rounds <= 0 or "driver" not in metafunc.fixturenames:
+        return
+    if metafunc.definition.get_closest_marker("benchmark") is not None:
+        return
+    metafunc.fixturenames.append("bench_round")
+    metafunc.parametrize("bench_round", range(rounds + 1), ids=round_id)
+
+
+def launch_profile(item):
+    """Return the launch profile name a test asks for"""
+    marker = item.get_closest_marker("launch_profile")
+    if marker is not None:
+        return marker.args[0]
+    return item.config.getoption("--launch-profile")
+
+
+def blocking_profile(config):
+    """Return the selected blocking profile with the budgets given on the command line"""
+    return get_profile(config.getoption("--blocking-profile")).with_budget(
+        max_requests=config.getoption("--max-page-requests"),
+        max_bytes=config.getoption("--max-page-bytes"),
+    )
+
+
+def driver_factory(config, launch_profile_name):
+    """Return the function that starts a browser for this run"""
+    return functools.partial(
+        get_driver,
+        performance_log=config.getoption("--site") == "record" or config.getoption("--calibrate-resource-sizes"),
+        blocking_profile=blocking_profile(config),
+        launch_profile=launch_profile_name,
+    )
+
+
+def driver_pool(config, launch_profile_name):
+    """Return the pool of warm browsers for a launch profile, or None when pooling is off"""
+    size = config.getoption("--driver-pool-size")
+    if size <= 0:
+        return None
+    pool = config._driver_pools.get(launch_profile_name)
+    if pool is None:
+        pool = config._driver_pools[launch_profile_name] = DriverPool(
+            size=size,
+            max_uses=config.getoption("--driver-max-uses"),
+            factory=driver_factory(config, launch_profile_name),
+        )
+    return pool
+
+
+def pytest_collection_finish(session):
+    """Start warming browsers as soon as we know a collected test needs one"""
+    from utils.parallel_runner import is_controller
+
+    config = session.config
+    if config.option.collectonly or is_controller(config):
+        # The parallel controller only dispatches tests, its workers hold the browsers
+        return
+    for item in session.items:
+        if "driver" in getattr(item, "fixturenames", ()):
+            driver_pool(config, launch_profile(item))
+
+
+def pytest_sessionfinish(session):
+    """Write the run reports; parallel workers leave their raw data for the controller to merge"""
+    write_web_metrics(session)
+    write_resource_report(session)
+    finish_benchmark(session)
+
+
+def write_web_metrics(session):
+    from utils.parallel_runner import gather_worker_data
+
+    collector = session.config._web_metrics
+    path = session.config.getoption("--perf-report")
+    if collector is None or not path:
+        return
+    worker_samples = gather_worker_data(path, collector.samples)
+    if worker_samples is None:
+        return
+    for samples in worker_samples:
+        collector.samples.extend(samples)
+    json_path, csv_path = collector.write_report(path)
+    print(f"\nWeb metrics report: {json_path}, {csv_path}")
+
+
+def write_resource_report(session):
+    from utils.parallel_runner import gather_worker_data
+
+    governor = session.config._governor
+    path = session.config.getoption("--resource-report")
+    if not path or not governor.enabled or session.config.option.collectonly:
+        return
+    worker_samples = gather_worker_data(path, governor.samples)
+    if worker_samples is None:
+        return
+    for samples in worker_samples:
+        governor.samples.extend(samples)
+    report = governor.write_report(path)
+    print(f"\nBrowser resource report: {path} ({report['recycles']} browsers recycled)")
+
+
+def finish_benchmark(session):
+    """Write the benchmark results and fail the run on phase regressions against the baseline"""
+    from utils.parallel_runner import gather_worker_data
+
+    config = session.config
+    benchmark = config._benchmark
+    if benchmark is None or config.option.collectonly:
+        return
+    output = config.getoption("--benchmark-output")
+    worker_data = gather_worker_data(output, {"rounds": benchmark.rounds, "locators": benchmark.locators})
+    if worker_data is None:
+        return
+    for data in worker_data:
+        benchmark.rounds.extend(data["rounds"])
+        benchmark.locators.extend(data["locators"])
+    benchmark.write_results(output)
+    print("\nBenchmark (per phase):\n" + benchmark.format_summary())
+    if benchmark.locators:
+        print("Locator lookups:\n" + format_rows(benchmark.locators))
+    print(f"Benchmark results: {output}")
+
+    baseline_path = config.getoption("--benchmark-baseline")
+    if config.getoption("--benchmark-save"):
+        benchmark.write_results(baseline_path)
+        print(f"Benchmark baseline saved: {baseline_path}")
+        return
+    baseline = benchmark.load_baseline(baseline_path)
+    if baseline is None:
+        print(f"No benchmark baseline at {baseline_path}, run with --benchmark-save to create one")
+        return
+    regressions = benchmark.compare(baseline)
+    if regressions:
+        print("Benchmark regressions:\n" + "\n".join(f"  {line}" for line in regressions))
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_unconfigure(config):
+    if getattr(config, "_artifacts", None) is not None:
+        config._artifacts.close()
+    for pool in getattr(config, "_driver_pools", {}).values():
+        pool.close()
+
+
+@pytest.fixture(scope="session")
+def site(request):
+    """In replay mode, serve the captures locally and point the page objects at them"""
+    if request.config.getoption("--site") != "replay":
+        yield None
+        return
+
+    server = ReplayServer(request.config.getoption("--capture-dir")).start()
+    live_url = HomePage.URL
+    HomePage.URL = server.url_for(live_url)
+    yield server
+    HomePage.URL = live_url
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def job_postings(request):
+    """All Lever postings as job records in --job-validation hybrid mode, otherwise None"""
+    config = request.config
+    if config.getoption("--job-validation") != "hybrid":
+        return None
+    capture_dir = config.getoption("--capture-dir")
+    if config.getoption("--site") == "replay":
+        postings = load_postings(capture_dir)
+    else:
+        postings = fetch_postings()
+        if config.getoption("--site") == "record":
+            save_postings(postings, capture_dir)
+    return [posting_record(posting) for posting in postings]
+
 
 @pytest.fixture
-def driver():
-    driver = get_driver()
+def scenario_benchmark(request):
+    """The run's ScenarioBenchmark; benchmark-only tests are skipped outside benchmark runs"""
+    if request.config._benchmark is None:
+        pytest.skip("benchmark-only test, run with --benchmark-rounds N --site replay")
+    return request.config._benchmark
+
+
+def parse_filter_combinations(values):
+    """Turn ['Istanbul, Turkiye=Quality Assurance'] into [('Istanbul, Turkiye', 'Quality Assurance')]"""
+    combinations = []
+    for value in values:
+        location, _, department = (part.strip() for part in value.partition("="))
+        if not location or not department:
+            raise ValueError(f"Bad filter combination '{value}', use <location>=<department>")
+        combinations.append((location, department))
+    return combinations
+
+
+@pytest.fixture
+def filter_matrix(request):
+    """The filter matrix to check: {'combinations': the given pairs or None to derive them, 'size': N}"""
+    return {
+        "combinations": request.config._filter_combinations or None,
+        "size": request.config.getoption("--filter-matrix-size"),
+    }
+
+
+@contextlib.contextmanager
+def teardown_step(name):
+    """Run one reporting step of the driver teardown; an error is printed instead of skipping the rest"""
+    try:
+        yield
+    except Exception as error:
+        print(f"Teardown step '{name}' failed: {error!r}")
+
+
+@pytest.fixture
+def driver(request, site):
+    benchmark = request.config._benchmark
+    if request.node.get_closest_marker("benchmark") is not None:
+        benchmark = None  # benchmark-only tests time themselves
+    if is_warmup(request.node):
+        benchmark = None  # warms the browser's checkpoints and caches, not measured
+    started = time.perf_counter()
+    profile_name = launch_profile(request.node)
+    pool = driver_pool(request.config, profile_name)
+    if pool is None:
+        driver = driver_factory(request.config, profile_name)()
+    else:
+        driver = pool.acquire()
+
+    governor = request.config._governor
+    metrics = request.config._web_metrics
+    tracer = request.config._tracer
+    recorder = None
+    monitor = None
+    # Listeners and hooks attached so far, removed again if the setup fails
+    attached = []
+    try:
+        usage_before = governor.start_test(driver)
+
+        if request.config.getoption("--consent") == "seeded":
+            seed_consent(driver, HomePage.URL)
+        else:
+            clear_consent(driver, HomePage.URL)
+
+        if request.config.getoption("--site") == "record":
+            recorder = SiteRecorder(driver, request.config.getoption("--capture-dir"))
+
+        profile = blocking_profile(request.config)
+        if profile.needs_monitoring() or request.config.getoption("--calibrate-resource-sizes"):
+            monitor = ResourceMonitor(driver, profile)
+
+        if metrics is not None:
+            metrics.attach(driver, request.node.nodeid)
+            attached.append(metrics.detach)
+        if benchmark is not None:
+            benchmark.start_round(scenario_name(request.node))
+            benchmark.record("driver_start", time.perf_counter() - started)
+            benchmark.attach(driver)
+            attached.append(benchmark.detach)
+        if tracer is not None:
+            trace_started = tracer.now()
+            tracer.attach(driver)
+            attached.append(tracer.detach)
+            tracer.begin(request.node.nodeid, "test")
+    except Exception:
+        # The teardown below is never reached: hand the browser back here or later tests
+        # wait for the pool until they time out
+        for detach in reversed(attached):
+            with teardown_step("setup cleanup"):
+                detach()
+        with teardown_step("driver disposal"):
+            if pool is None:
+                driver.quit()
+            else:
+                pool.recycle(driver)
+        raise
+
     yield driver
-    driver.quit()
+
+    # Every reporting step below may fail on a dead browser (chromedriver gone raises
+    # urllib3 errors, not WebDriverException); the browser is handed back regardless.
+    report = getattr(request.node, "rep_call", None)
+    failed = report is not None and report.failed
+    violations = []
+    slow_pages = []
+    usage = None
+    try:
+        if failed and request.config._artifacts is not None:
+            with teardown_step("failure artifacts"):
+                artifacts = request.config._artifacts.capture(driver, request.node.nodeid)
+                request.node.user_properties.append(("artifacts", artifacts))
+                print(f"Failure artifacts: {artifacts}")
+        if tracer is not None:
+            tracer.end(request.node.nodeid, "test")
+            tracer.detach()
+            if request.config.getoption("--step-trace") == "all" or failed:
+                with teardown_step("step trace"):
+                    path = tracer.export(
+                        os.path.join(request.config.getoption("--step-trace-dir"), trace_file_name(request.node.nodeid)),
+                        since=trace_started,
+                    )
+                    request.node.user_properties.append(("trace", path))
+                    print(f"Step trace written: {path}")
+
+        if benchmark is not None:
+            benchmark.detach()
+            started = time.perf_counter()
+
+        if recorder is not None:
+            with teardown_step("site recorder"):
+                recorder.stop()
+        if monitor is not None:
+            with teardown_step("resource monitor"):
+                totals = monitor.stop()
+                violations = monitor.budget_violations()
+                request.node.user_properties.extend(totals.items())
+                print(
+                    f"Blocked {totals['requests_blocked']} requests (~{totals['bytes_saved']} bytes saved), "
+                    f"loaded {totals['requests_loaded']} requests ({totals['bytes_loaded']} bytes)"
+                )
+                if totals["blocked_without_size"]:
+                    print(
+                        f"{totals['blocked_without_size']} blocked requests have no recorded size, "
+                        "run once with --calibrate-resource-sizes to include them in the bytes saved"
+                    )
+        if metrics is not None:
+            with teardown_step("web metrics"):
+                slow_pages = metrics.detach()
+        with teardown_step("resource governor"):
+            usage = governor.finish_test(driver, request.node.nodeid, usage_before)
+            if usage is not None:
+                request.node.user_properties.append(("browser_rss_delta_bytes", usage["rss_delta_bytes"]))
+                request.node.user_properties.append(("browser_cpu_delta_seconds", round(usage["cpu_delta_seconds"], 3)))
+    finally:
+        if pool is None:
+            driver.quit()
+        elif usage is not None and usage["recycled"]:
+            print(f"Recycling browser: {usage['recycled']}")
+            pool.recycle(driver)
+        else:
+            pool.release(driver)
+        if benchmark is not None:
+            benchmark.record("teardown", time.perf_counter() - started)
+            benchmark.finish_round()
+
+    if violations:
+        pytest.fail("Resource budget exceeded:\n" + "\n".join(violations))
+    if slow_pages:
+        pytest.fail("Web metrics over threshold:\n" + "\n".join(slow_pages))
@@ -0,0 +1,107 @@
+# pages/base_page.py
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from utils.element_cache import ElementCache
+from utils.steps import page_steps
+
+# Resolves named locators and reports which are rendered, in one script execution.
+# An element counts as visible when it has a layout box and is not hidden by CSS,
+# which is what is_displayed() checks; it does not have to be scrolled into view.
+VISIBILITY_MAP_JS = """
+const find = (strategy, selector) => {
+    if (strategy === 'id') return document.getElementById(selector);
+    if (strategy === 'css') return document.querySelector(selector);
+    return document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+};
+const isVisible = (element) => {
+    if (!element) return false;
+    if (element.checkVisibility) return element.checkVisibility({checkOpacity: true, checkVisibilityCSS: true});
+    const rect = element.getBoundingClientRect();
+    const style = window.getComputedStyle(element);
+    return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.opacity !== '0';
+};
+const visible = {};
+for (const [name, strategy, selector] of arguments[0]) {
+    visible[name] = isVisible(find(strategy, selector));
+}
+return visible;
+"""
+
+SCRIPT_STRATEGIES = {By.ID: "id", By.CSS_SELECTOR: "css", By.XPATH: "xpath"}
+
+# Wait conditions of element(): (condition on a locator, condition on an already found element)
+ELEMENT_CONDITIONS = {
+    "present": (EC.presence_of_element_located, None),
+    "visible": (EC.visibility_of_element_located, EC.visibility_of),
+    "clickable": (EC.element_to_be_clickable, EC.element_to_be_clickable),
+}
+
+
+@page_steps
+class BasePage:
+    """Shared helpers of the page objects"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.wait = WebDriverWait(driver, 10)
+        # Shared by all page objects of the driver, cleared when the document changes
+        self.element_cache = ElementCache.for_driver(driver)
+
+    # -------------------
+    # Element Lookup
+    # -------------------
+
+    def element(self, locator, until="present"):
+        """
+        Return the element of `locator` once it is present, visible or clickable.
+
+        An element found before on the same document is reused without a new lookup
+        (only the visibility or clickability check runs, "present" returns it as is);
+        a stale cached element is looked up again by its locator.
+        """
+        by_locator, by_element = ELEMENT_CONDITIONS[until]
+        cached = self.element_cache.get(locator)
+        if cached is not None:
+            if by_element is None:
+                return cached
+            try:
+                return self.wait.until(by_element(cached))
+            except StaleElementReferenceException:
+                # The element is gone from the page; wait for it by locator below
+                self.element_cache.invalidate(locator)
+        return self.element_cache.put(locator, self.wait.until(by_locator(locator)))
+
+    # -------------------
+    # Bulk Visibility
+    # -------------------
+
+    def visibility_map(self, locators, timeout=10):
+        """
+        Check a set of named locators, e.g. {"Finance": (By.XPATH, "...")}, in one
+        script execution and return {"Finance": True, ...}.
+
+        Locators that are not visible yet are re-checked (only those) until they
+        appear or `timeout` runs out; the ones still missing are False in the map.
+        """
+        for by, _ in locators.values():
+            if by not in SCRIPT_STRATEGIES:
+                raise ValueError(f"Unsupported locator strategy '{by}' for visibility_map")
+
+        visible = dict.fromkeys(locators, False)
+
+        def all_visible(driver):
+            missing = [
+                [name, SCRIPT_STRATEGIES[by], selector]
+                for name, (by, selector) in locators.items()
+                if not visible[name]
+            ]
+            visible.update(driver.execute_script(VISIBILITY_MAP_JS, missing))
+            return all(visible.values())
+
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(all_visible)
+        except TimeoutException:
+            pass
+        return visible
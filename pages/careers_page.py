@@ -1,13 +1,13 @@
 # pages/careers_page.py
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from pages.base_page import BasePage
+from utils.steps import page_steps
 
-class CareersPage:
+@page_steps
+class CareersPage(BasePage):
     def __init__(self, driver):
-        self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        super().__init__(driver)
         self.actions = ActionChains(driver)
 
         # -------------------
@@ -22,13 +22,23 @@ class CareersPage:
         self.LIFE_AT_INSIDER = (By.XPATH, "//h2[text()='Life at Insider']")
         self.QA_TEAM = (By.XPATH, "//h3[text()='Quality Assurance']")
 
+        # Sections checked together by sections_visibility()
+        self.SECTIONS = {
+            "Finance team": self.FINANCE_TEAM,
+            "Marketing team": self.MARKETING_TEAM,
+            "CEO team": self.CEO_TEAM,
+            "Locations title": self.LOCATIONS_TITLE,
+            "Locations description": self.LOCATIONS_DESC,
+            "Life at Insider": self.LIFE_AT_INSIDER,
+        }
+
     # -------------------
     # Helper Methods
     # -------------------
 
     def scroll_to_element(self, element_locator):
         """Scroll the page to make the element visible in the viewport"""
-        element = self.wait.until(EC.presence_of_element_located(element_locator))
+        element = self.element(element_locator)
         self.actions.move_to_element(element).perform()
         print(f"Scrolled to element: {element_locator}")
 
@@ -40,14 +50,14 @@ class CareersPage:
         """Scroll to 'See all teams' and click the link"""
         print("Clicking 'See all teams'...")
         self.scroll_to_element(self.SEE_ALL_TEAMS)
-        self.wait.until(EC.element_to_be_clickable(self.SEE_ALL_TEAMS)).click()
+        self.element(self.SEE_ALL_TEAMS, until="clickable").click()
         print("'See all teams' clicked ✅")
 
     def is_finance_visible(self):
         """Check if Finance team section is visible"""
         print("Checking Finance team visibility...")
         self.scroll_to_element(self.FINANCE_TEAM)
-        visible = self.wait.until(EC.visibility_of_element_located(self.FINANCE_TEAM)).is_displayed()
+        visible = self.element(self.FINANCE_TEAM, until="visible").is_displayed()
         print(f"Finance team visible: {visible}")
         return visible
 
@@ -55,7 +65,7 @@ class CareersPage:
         """Check if Marketing team section is visible"""
         print("Checking Marketing team visibility...")
         self.scroll_to_element(self.MARKETING_TEAM)
-        visible = self.wait.until(EC.visibility_of_element_located(self.MARKETING_TEAM)).is_displayed()
+        visible = self.element(self.MARKETING_TEAM, until="visible").is_displayed()
         print(f"Marketing team visible: {visible}")
         return visible
 
@@ -63,10 +73,18 @@ class CareersPage:
         """Check if CEO’s Executive Office section is visible"""
         print("Checking CEO team visibility...")
         self.scroll_to_element(self.CEO_TEAM)
-        visible = self.wait.until(EC.visibility_of_element_located(self.CEO_TEAM)).is_displayed()
+        visible = self.element(self.CEO_TEAM, until="visible").is_displayed()
         print(f"CEO team visible: {visible}")
         return visible
 
+    def sections_visibility(self):
+        """Check every section of the expanded careers page in one round trip"""
+        print("Checking visibility of all careers sections...")
+        visible = self.visibility_map(self.SECTIONS)
+        for name, is_visible in visible.items():
+            print(f"{name} visible: {is_visible}")
+        return visible
+
     # -------------------
     # Locations Section Methods
     # -------------------
@@ -75,14 +93,14 @@ class CareersPage:
         """Check if Locations title is visible"""
         print("Checking Locations title visibility...")
         self.scroll_to_element(self.LOCATIONS_TITLE)
-        visible = self.wait.until(EC.visibility_of_element_located(self.LOCATIONS_TITLE)).is_displayed()
+        visible = self.element(self.LOCATIONS_TITLE, until="visible").is_displayed()
         print(f"Locations title visible: {visible}")
         return visible
 
     def is_locations_desc_visible(self):
         """Check if Locations description is visible"""
         print("Checking Locations description visibility...")
-        visible = self.wait.until(EC.visibility_of_element_located(self.LOCATIONS_DESC)).is_displayed()
+        visible = self.element(self.LOCATIONS_DESC, until="visible").is_displayed()
         print(f"Locations description visible: {visible}")
         return visible
 
@@ -94,7 +112,7 @@ class CareersPage:
         """Check if 'Life at Insider' section is visible"""
         print("Checking 'Life at Insider' section visibility...")
         self.scroll_to_element(self.LIFE_AT_INSIDER)
-        visible = self.wait.until(EC.visibility_of_element_located(self.LIFE_AT_INSIDER)).is_displayed()
+        visible = self.element(self.LIFE_AT_INSIDER, until="visible").is_displayed()
         print(f"'Life at Insider' section visible: {visible}")
         return visible
 
@@ -105,8 +123,8 @@ class CareersPage:
     def click_qa_team(self):
         """Scroll to QA team section and click it"""
         print("Clicking QA team section...")
-        qa = self.wait.until(EC.presence_of_element_located(self.QA_TEAM))
+        qa = self.element(self.QA_TEAM)
         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", qa)
-        self.wait.until(EC.element_to_be_clickable(self.QA_TEAM))
+        self.element(self.QA_TEAM, until="clickable")
         self.driver.execute_script("arguments[0].click();", qa)
         print("QA team section clicked ✅")
@@ -1,9 +1,18 @@
 # pages/home_page.py
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from pages.base_page import BasePage
+from utils.steps import page_steps
 
-class HomePage:
+@page_steps
+class HomePage(BasePage):
+    # Redirected to the local replay server when running with --site replay
     URL = "https://useinsider.com/"
 
     COOKIE_DECLINE_BTN = (By.ID, "wt-cli-reject-btn")
@@ -11,36 +20,43 @@ class HomePage:
     CAREERS_LINK = (By.XPATH, "//a[contains(text(),'Careers')]")
     INSIDER_LOGO = (By.CSS_SELECTOR, "img[alt='insider_logo']")
 
-    def __init__(self, driver):
-        self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
-
     def open(self):
         """Open Insider homepage"""
         self.driver.get(self.URL)
         print("Opened Insider homepage")
 
-    def decline_cookies_if_present(self):
-        """Click 'Decline' button if cookies popup appears"""
+    def decline_cookies_if_present(self, timeout=0):
+        """
+        Click 'Decline' if the cookies popup is showing.
+        By default this is an immediate DOM check that never waits for the popup
+        (runs seed the consent cookies, see utils.consent); pass a timeout to wait for it.
+        """
         try:
-            decline_btn = self.wait.until(EC.element_to_be_clickable(self.COOKIE_DECLINE_BTN))
-            decline_btn.click()
-            print("Cookies declined")
-        except:
-            print("No cookies popup found")
+            if timeout:
+                buttons = [WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable(self.COOKIE_DECLINE_BTN))]
+            else:
+                buttons = self.driver.find_elements(*self.COOKIE_DECLINE_BTN)
+            if buttons and buttons[0].is_displayed():
+                buttons[0].click()
+                print("Cookies declined")
+                return True
+        except (TimeoutException, StaleElementReferenceException, ElementNotInteractableException):
+            pass
+        print("No cookies popup found")
+        return False
 
     def go_to_careers(self):
         """Navigate to Careers page via Company menu"""
-        company = self.wait.until(EC.element_to_be_clickable(self.COMPANY_MENU))
+        company = self.element(self.COMPANY_MENU, until="clickable")
         company.click()
         print("Clicked Company menu")
-        careers = self.wait.until(EC.element_to_be_clickable(self.CAREERS_LINK))
+        careers = self.element(self.CAREERS_LINK, until="clickable")
         careers.click()
         print("Clicked Careers link")
 
     def is_logo_visible(self):
         """Check if the Insider logo is visible on the page"""
-        logo = self.wait.until(EC.visibility_of_element_located(self.INSIDER_LOGO))
+        logo = self.element(self.INSIDER_LOGO, until="visible")
         if logo.is_displayed():
             print("Insider logo is visible")
         else:
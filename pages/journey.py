@@ -0,0 +1,182 @@
+# pages/journey.py
+import json
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from pages.home_page import HomePage
+from pages.careers_page import CareersPage
+from pages.qa_page import QAJobsPage
+
+STORAGE_SNAPSHOT_JS = """
+return JSON.stringify({
+    origin: window.location.origin,
+    local: Object.assign({}, window.localStorage),
+    session: Object.assign({}, window.sessionStorage),
+});
+"""
+
+# Runs before any page script of the restored document so the page starts with its saved storage
+STORAGE_RESTORE_JS = """
+(function (snapshot) {
+    if (window.location.origin !== snapshot.origin) return;
+    for (const [key, value] of Object.entries(snapshot.local)) window.localStorage.setItem(key, value);
+    for (const [key, value] of Object.entries(snapshot.session)) window.sessionStorage.setItem(key, value);
+})(%s);
+"""
+
+
+class Checkpoint:
+    """A named state of the careers funnel, reached from its parent by running `step`"""
+
+    def __init__(self, name, parent, step, verify=None):
+        self.name = name
+        self.parent = parent
+        self.step = step
+        # Restorable checkpoints can be re-entered by deep link; `verify` confirms the restored page
+        self.verify = verify
+
+
+class Journey:
+    """
+    Careers funnel modelled as a graph of named checkpoints:
+
+    home -> careers -> all_teams -> qa_team -> qa_jobs -> qa_jobs_filtered
+
+    The first time a browser reaches a checkpoint its URL, cookies and storage are
+    captured. Later tests on the same browser restore the deepest captured checkpoint
+    on their path and only run the remaining steps. When a restore fails the whole
+    path is replayed from the home page.
+    """
+
+    FILTER_LOCATION = "Istanbul, Turkiye"
+    FILTER_DEPARTMENT = "Quality Assurance"
+
+    # Snapshots per browser session, kept across tests because pooled browsers are reused
+    _snapshots = {}
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.checkpoints = {}
+
+        self.add("home", None, self._open_home, verify=self._verify_home)
+        self.add("careers", "home", lambda: HomePage(driver).go_to_careers(), verify=self._verify_careers)
+        # The expanded team list is in-page state, so it is re-run on top of careers
+        self.add("all_teams", "careers", lambda: CareersPage(driver).click_see_all_teams())
+        self.add("qa_team", "all_teams", lambda: CareersPage(driver).click_qa_team(), verify=self._verify_qa_team)
+        self.add("qa_jobs", "qa_team", lambda: QAJobsPage(driver).click_see_all_qa_jobs(), verify=self._verify_qa_jobs)
+        # Filter state lives in page scripts only, so it is re-run on top of qa_jobs as well
+        self.add("qa_jobs_filtered", "qa_jobs", self._apply_filters)
+
+    # -------------------
+    # Graph Methods
+    # -------------------
+
+    def add(self, name, parent, step, verify=None):
+        """Register a checkpoint reached from `parent` by running `step`"""
+        self.checkpoints[name] = Checkpoint(name, parent, step, verify)
+
+    def path(self, name):
+        """Return the checkpoints from the root to `name`"""
+        path = []
+        checkpoint = self.checkpoints[name]
+        while checkpoint is not None:
+            path.insert(0, checkpoint)
+            checkpoint = self.checkpoints.get(checkpoint.parent)
+        return path
+
+    def reach(self, name):
+        """Bring the browser to checkpoint `name`, restoring the longest captured prefix"""
+        path = self.path(name)
+        snapshots = self._snapshots.setdefault(self.driver.session_id, {})
+
+        start = 0
+        for index in reversed(range(len(path))):
+            checkpoint = path[index]
+            if checkpoint.verify is None or checkpoint.name not in snapshots:
+                continue
+            if self._restore(checkpoint, snapshots[checkpoint.name]):
+                print(f"Restored checkpoint '{checkpoint.name}' ✅")
+                start = index + 1
+            else:
+                print(f"Restoring checkpoint '{checkpoint.name}' failed, replaying from home page")
+                snapshots.pop(checkpoint.name, None)
+            break
+
+        for checkpoint in path[start:]:
+            print(f"Running step to checkpoint '{checkpoint.name}'...")
+            checkpoint.step()
+            if checkpoint.verify is not None:
+                snapshots[checkpoint.name] = self._snapshot()
+
+    # -------------------
+    # Snapshot Methods
+    # -------------------
+
+    def _snapshot(self):
+        """Capture URL, cookies and storage of the current page"""
+        return {
+            "url": self.driver.current_url,
+            "cookies": self.driver.get_cookies(),
+            "storage": json.loads(self.driver.execute_script(STORAGE_SNAPSHOT_JS)),
+        }
+
+    def _restore(self, checkpoint, snapshot):
+        """Deep link to a captured checkpoint; return False if the page is not what we captured"""
+        script_id = None
+        try:
+            if hasattr(self.driver, "execute_cdp_cmd"):
+                script_id = self.driver.execute_cdp_cmd(
+                    "Page.addScriptToEvaluateOnNewDocument",
+                    {"source": STORAGE_RESTORE_JS % json.dumps(snapshot["storage"])},
+                )["identifier"]
+                for cookie in snapshot["cookies"]:
+                    self.driver.execute_cdp_cmd("Network.setCookie", self._cdp_cookie(cookie))
+                self.driver.get(snapshot["url"])
+            else:
+                self.driver.get(snapshot["url"])
+                for cookie in snapshot["cookies"]:
+                    self.driver.add_cookie(cookie)
+                self.driver.refresh()
+            checkpoint.verify()
+            return True
+        except WebDriverException:
+            return False
+        finally:
+            if script_id is not None:
+                self.driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+
+    @staticmethod
+    def _cdp_cookie(cookie):
+        cdp_cookie = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly") if key in cookie}
+        if "expiry" in cookie:
+            cdp_cookie["expires"] = cookie["expiry"]
+        if "sameSite" in cookie:
+            cdp_cookie["sameSite"] = cookie["sameSite"]
+        return cdp_cookie
+
+    # -------------------
+    # Steps and Checks
+    # -------------------
+
+    def _open_home(self):
+        home = HomePage(self.driver)
+        home.open()
+        home.decline_cookies_if_present()
+
+    def _apply_filters(self):
+        qa_page = QAJobsPage(self.driver)
+        qa_page.filter_location(self.FILTER_LOCATION)
+        qa_page.filter_department(self.FILTER_DEPARTMENT)
+
+    def _verify_home(self):
+        WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located(HomePage.INSIDER_LOGO))
+
+    def _verify_careers(self):
+        WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(CareersPage(self.driver).SEE_ALL_TEAMS))
+
+    def _verify_qa_team(self):
+        WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(QAJobsPage(self.driver).SEE_ALL_JOBS_BUTTON))
+
+    def _verify_qa_jobs(self):
+        QAJobsPage(self.driver).wait_for_job_list()
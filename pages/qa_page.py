@@ -1,25 +1,83 @@
+import random
+
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-import time
+from pages.base_page import BasePage
+from utils import readiness
+from utils.lever_api import posting_id
+from utils.steps import page_steps
+
+# Reads every job card (or only the cards at the given indices) in a single script execution
+JOB_RECORDS_JS = """
+const [cardSelector, positionSelector, departmentSelector, locationSelector, linkSelector, indices] = arguments;
+const text = (card, selector) => {
+    const element = card.querySelector(selector);
+    return element ? (element.innerText || element.textContent).trim() : '';
+};
+let cards = Array.from(document.querySelectorAll(cardSelector));
+if (indices) cards = indices.map((index) => cards[index]).filter(Boolean);
+return cards.map((card) => {
+    const link = card.querySelector(linkSelector);
+    return {
+        position: text(card, positionSelector),
+        department: text(card, departmentSelector),
+        location: text(card, locationSelector),
+        href: link ? link.href : '',
+    };
+});
+"""
+
+# Sets select filters through select2's jQuery API (or a plain change event) instead of clicks.
+# Takes [[select css, option label], ...] and returns the selects whose value changed.
+SET_FILTERS_JS = """
+const changed = [];
+for (const [css, label] of arguments[0]) {
+    const select = document.querySelector(css);
+    if (!select) return {error: `No filter select ${css}`};
+    const options = Array.from(select.options);
+    const option = options.find((o) => o.text.trim() === label) || options.find((o) => o.text.includes(label));
+    if (!option) return {error: `No option '${label}' in ${css}`};
+    if (select.value === option.value) continue;
+    changed.push(css);
+    if (window.jQuery) {
+        window.jQuery(select).val(option.value).trigger('change');
+    } else {
+        select.value = option.value;
+        select.dispatchEvent(new Event('change', {bubbles: true}));
+    }
+}
+return {changed: changed};
+"""
 
-class QAJobsPage:
+# Option labels of the filter selects, without the "All" placeholder
+FILTER_OPTIONS_JS = """
+const labels = (css) => Array.from(document.querySelectorAll(css + ' option'))
+    .filter((o) => o.value && o.value.toLowerCase() !== 'all')
+    .map((o) => o.text.trim());
+return {location: labels(arguments[0]), department: labels(arguments[1])};
+"""
+
+@page_steps
+class QAJobsPage(BasePage):
     def __init__(self, driver):
         """
         Initialize the QAJobsPage with a Selenium WebDriver instance
         and define all element locators.
         """
-        self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        super().__init__(driver)
 
         # Element locators
         self.SEE_ALL_JOBS_BUTTON = (By.XPATH, "//a[contains(text(), 'See all QA jobs')]")
         self.LOCATION_FILTER_BUTTON = (By.ID, "select2-filter-by-location-container")
         self.DEPARTMENT_FILTER_BUTTON = (By.ID, "select2-filter-by-department-container")
         self.LOCATION_OPTION = "//li[contains(text(), '{}')]"
-        self.JOB_LIST = (By.CSS_SELECTOR, "div.job-list")
-        self.JOB_POSITION = (By.CSS_SELECTOR, "span.position-department")
+        self.LOCATION_SELECT_CSS = "select#filter-by-location"
+        self.DEPARTMENT_SELECT_CSS = "select#filter-by-department"
+        self.JOB_LIST_CSS = "div.job-list"
+        self.JOB_LIST = (By.CSS_SELECTOR, self.JOB_LIST_CSS)
+        self.JOB_POSITION = (By.CSS_SELECTOR, "p.position-title")
         self.JOB_LOCATION = (By.CSS_SELECTOR, "div.position-location")
         self.JOB_DEPARTMENT = (By.CSS_SELECTOR, "span.position-department") 
         self.JOB_CARDS = (By.CSS_SELECTOR, "div.position-list-item")
@@ -29,78 +87,174 @@ class QAJobsPage:
     def click_see_all_qa_jobs(self):
         """Click the 'See all QA jobs' button to display the full QA job list."""
         print("Clicking 'See all QA jobs' button...")
-        button = self.wait.until(EC.element_to_be_clickable(self.SEE_ALL_JOBS_BUTTON))
+        button = self.element(self.SEE_ALL_JOBS_BUTTON, until="clickable")
         button.click()
         print("'See all QA jobs' button clicked ✅")
-        time.sleep(1)
+        self.wait_for_job_list()
 
-    def filter_department(self, department_name):
-        """Apply a department filter by selecting the desired department."""
-        print(f"Applying department filter: {department_name}")
-        self.wait.until(EC.element_to_be_clickable(self.DEPARTMENT_FILTER_BUTTON)).click()
+    def wait_for_job_list(self):
+        """Wait until the job list and the filter options have been loaded and rendered."""
+        print("Waiting for job list to load...")
+        wait = WebDriverWait(self.driver, 30)
+        wait.until(readiness.select_has_options(self.LOCATION_SELECT_CSS))
+        wait.until(EC.presence_of_all_elements_located(self.JOB_CARDS))
+        wait.until(readiness.network_idle())
+        wait.until(readiness.list_quiet(self.JOB_LIST_CSS))
+        print("Job list loaded ✅")
+
+    def _select_filter_option(self, filter_button, option_text):
+        """Open a select2 filter, pick the option and wait for the job list to re-render."""
+        rendered = readiness.watch_list(self.driver, self.JOB_LIST_CSS)
+        button = self.element(filter_button, until="clickable")
+        # Re-selecting the current value may not re-render the list
+        already_selected = option_text in button.text
+        button.click()
+        self.wait.until(readiness.select2_open())
         option = self.wait.until(
-            EC.visibility_of_element_located((By.XPATH, self.LOCATION_OPTION.format(department_name)))
+            EC.element_to_be_clickable((By.XPATH, self.LOCATION_OPTION.format(option_text)))
         )
         option.click()
+        self.wait.until(readiness.select2_closed())
+        if already_selected:
+            self.wait.until(readiness.network_idle())
+            self.wait.until(readiness.list_quiet(self.JOB_LIST_CSS))
+        else:
+            self.wait.until(readiness.list_rerendered(self.JOB_LIST_CSS, rendered))
+            # Elements found before the re-render may be detached or no longer match
+            self.element_cache.invalidate()
+
+    def filter_department(self, department_name):
+        """Apply a department filter by selecting the desired department."""
+        print(f"Applying department filter: {department_name}")
+        self._select_filter_option(self.DEPARTMENT_FILTER_BUTTON, department_name)
         print(f"Department filter applied: {department_name} ✅")
-        time.sleep(1)
 
     def filter_location(self, location_name):
         """Apply a location filter by selecting the desired location."""
         print(f"Applying location filter: {location_name}")
-        self.wait.until(EC.element_to_be_clickable(self.LOCATION_FILTER_BUTTON)).click()
-        option = self.wait.until(
-            EC.element_to_be_clickable((By.XPATH, self.LOCATION_OPTION.format(location_name)))
-        )
-        option.click()
+        self._select_filter_option(self.LOCATION_FILTER_BUTTON, location_name)
         print(f"Location filter applied: {location_name} ✅")
-        time.sleep(1)
+
+    def set_filters(self, location=None, department=None):
+        """
+        Set the location and/or department filter through the select2 JS API (no clicks)
+        and wait for the job list to re-render. Returns True if a filter changed.
+        """
+        filters = [
+            [css, label]
+            for css, label in ((self.LOCATION_SELECT_CSS, location), (self.DEPARTMENT_SELECT_CSS, department))
+            if label is not None
+        ]
+        rendered = readiness.watch_list(self.driver, self.JOB_LIST_CSS)
+        result = self.driver.execute_script(SET_FILTERS_JS, filters)
+        assert "error" not in result, result.get("error")
+        if result["changed"]:
+            self.wait.until(readiness.list_rerendered(self.JOB_LIST_CSS, rendered))
+            self.element_cache.invalidate()
+        else:
+            self.wait.until(readiness.network_idle())
+            self.wait.until(readiness.list_quiet(self.JOB_LIST_CSS))
+        print(f"Filters set: location={location}, department={department} ✅")
+        return bool(result["changed"])
+
+    def filter_options(self):
+        """Return the option labels of the location and department filters."""
+        return self.driver.execute_script(FILTER_OPTIONS_JS, self.LOCATION_SELECT_CSS, self.DEPARTMENT_SELECT_CSS)
 
     def scroll_job_list(self):
         """Scroll down the page slightly to make job cards visible."""
         print("Scrolling job list...")
         self.driver.execute_script("window.scrollTo(0, 500);")
-        time.sleep(2)
+        # The cards are what the next steps look at; the rest of the page may keep animating
+        self.wait.until(EC.visibility_of_element_located(self.JOB_CARDS))
         print("Job list scrolled ✅")
 
     def is_senior_position_visible(self):
         """Verify if the Senior Software QA Engineer position is visible."""
         print("Checking visibility of Senior Software QA Engineer position...")
-        visible = self.wait.until(
-            EC.visibility_of_element_located(self.SENIOR_POSITION)
-        ).is_displayed()
+        visible = self.element(self.SENIOR_POSITION, until="visible").is_displayed()
         print(f"Senior position visible: {visible}")
         return visible
 
-    def validate_all_jobs(self, expected_position, expected_department, expected_location):
+    def get_job_records(self, indices=None):
         """
-        Validate that all job cards match the expected position, department, and location.
-        Handles stale element references by re-fetching job cards each iteration.
+        Return every job card (or the cards at `indices`) as a dict with position,
+        department, location and the View Role href, read in one round trip to the browser.
         """
-        print("Validating all QA job cards...")
-        job_cards = self.wait.until(EC.presence_of_all_elements_located(self.JOB_CARDS))
-        assert len(job_cards) > 0, "No job cards found!"
-        print(f"Total job cards found: {len(job_cards)}")
+        self.wait.until(EC.presence_of_all_elements_located(self.JOB_CARDS))
+        return self.read_job_records(indices)
 
-        for index in range(len(job_cards)):
-            # Re-fetch the job list each time to avoid stale element references
-            job_cards = self.wait.until(EC.presence_of_all_elements_located(self.JOB_CARDS))
-            job = job_cards[index]
+    def read_job_records(self, indices=None):
+        """Like get_job_records, without waiting for cards (an empty filtered list returns [])."""
+        return self.driver.execute_script(
+            JOB_RECORDS_JS,
+            self.JOB_CARDS[1],
+            self.JOB_POSITION[1],
+            self.JOB_DEPARTMENT[1],
+            self.JOB_LOCATION[1],
+            self.VIEW_ROLE_BUTTONS[1],
+            indices,
+        )
 
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", job)
-            time.sleep(0.5)
+    def count_job_cards(self):
+        """Return the number of job cards without transferring them."""
+        self.wait.until(EC.presence_of_all_elements_located(self.JOB_CARDS))
+        return self.driver.execute_script("return document.querySelectorAll(arguments[0]).length;", self.JOB_CARDS[1])
 
-            position_department = job.find_element(By.CSS_SELECTOR, "span.position-department").text
-            location = job.find_element(By.CSS_SELECTOR, "div.position-location").text
+    @staticmethod
+    def find_job_mismatches(records, expected_position, expected_department, expected_location):
+        """Return a readable line for every field of every record that does not match."""
+        mismatches = []
+        for index, record in enumerate(records, start=1):
+            # The position may be named in the title or only in the department label
+            if expected_position not in record["position"] and expected_position not in record["department"]:
+                mismatches.append(f"Job {index}: Position mismatch: {record['position']}")
+            if expected_department not in record["department"]:
+                mismatches.append(f"Job {index}: Department mismatch: {record['department']}")
+            if expected_location not in record["location"]:
+                mismatches.append(f"Job {index}: Location mismatch: {record['location']}")
+        return mismatches
 
-            print(f"Job {index+1}: {position_department} | {location}")
+    def validate_all_jobs(self, expected_position, expected_department, expected_location):
+        """
+        Validate that all job cards match the expected position, department, and location.
+        All cards are read in one script execution and every mismatch is reported together.
+        """
+        print("Validating all QA job cards...")
+        records = self.get_job_records()
+        assert len(records) > 0, "No job cards found!"
+        print(f"Total job cards found: {len(records)}")
 
-            assert expected_position in position_department, f"Position mismatch: {position_department}"
-            assert expected_department in position_department, f"Department mismatch: {position_department}"
-            assert expected_location in location, f"Location mismatch: {location}"
+        mismatches = self.find_job_mismatches(records, expected_position, expected_department, expected_location)
+        assert not mismatches, "Job cards do not match the filters:\n" + "\n".join(mismatches)
 
         print("All job cards validated ✅")
 
+    def confirm_job_sample(self, expected_records, sample_size=3):
+        """
+        Confirm the rendered list against records already validated through the Lever API:
+        the card count must match, and a random sample of cards (View Role links included)
+        must show the position, department and location of the posting they link to.
+        """
+        print(f"Confirming {sample_size} random job cards against {len(expected_records)} postings...")
+        total = self.count_job_cards()
+        assert total == len(expected_records), f"Job list shows {total} cards, Lever has {len(expected_records)} postings"
+
+        expected_by_id = {record["id"]: record for record in expected_records}
+        indices = random.sample(range(total), min(sample_size, total))
+        mismatches = []
+        for index, card in zip(indices, self.get_job_records(indices)):
+            expected = expected_by_id.get(posting_id(card["href"]))
+            if expected is None:
+                mismatches.append(f"Job {index + 1}: View Role link {card['href']} is not a listed posting")
+                continue
+            for field in ("position", "department", "location"):
+                # innerText follows CSS text-transform, so compare case-insensitively
+                if " ".join(card[field].split()).casefold() != " ".join(expected[field].split()).casefold():
+                    mismatches.append(f"Job {index + 1}: {field} '{card[field]}' != posting '{expected[field]}'")
+        assert not mismatches, "Job cards do not match the Lever postings:\n" + "\n".join(mismatches)
+        print(f"Sampled job cards {sorted(index + 1 for index in indices)} match the Lever postings ✅")
+
     def click_first_view_role_and_switch(self):
         """
         Hover over the first job card, click the 'View Role' button, 
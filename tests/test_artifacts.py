@@ -0,0 +1,82 @@
+import gzip
+import json
+import os
+
+from urllib3.exceptions import MaxRetryError
+
+from utils.artifacts import ArtifactStore
+
+
+class FakeDriver:
+    """Serves fixed artifacts; a crashed chromedriver makes every grab fail"""
+
+    def __init__(self, dom="<html>same page</html>", error=None):
+        self.dom = dom
+        self.error = error
+
+    def _answer(self, value):
+        if self.error is not None:
+            raise self.error
+        return value
+
+    @property
+    def current_url(self):
+        return self._answer("https://useinsider.com/careers/")
+
+    @property
+    def page_source(self):
+        return self._answer(self.dom)
+
+    def get_screenshot_as_base64(self):
+        return self._answer("iVBORw0KGgo=")
+
+    def get_log(self, log_type):
+        return self._answer([{"level": "SEVERE", "message": "boom"}])
+
+    def execute_script(self, script):
+        return self._answer([])
+
+
+def test_identical_dom_snapshots_are_stored_once(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    store.capture(FakeDriver(), "tests/test_a.py::test_one")
+    store.capture(FakeDriver(), "tests/test_a.py::test_two")
+    store.close()
+
+    assert len(os.listdir(tmp_path / "dom")) == 1
+    assert os.path.exists(tmp_path / "tests_test_a.py__test_two" / "manifest.json")
+
+
+def test_oldest_artifacts_are_evicted_over_the_size_cap(tmp_path):
+    # About 1.1 kB of compressed DOM per test, so three tests fit under the cap
+    store = ArtifactStore(str(tmp_path), max_bytes=4000, workers=1)
+    for index in range(5):
+        store.capture(FakeDriver(dom=f"<html>{os.urandom(1000).hex()}</html>"), f"test_{index}")
+    store.close()
+
+    remaining = [os.path.join(root, name) for root, _, names in os.walk(tmp_path) for name in names]
+    assert sum(os.path.getsize(path) for path in remaining) <= 4000
+    assert os.path.exists(tmp_path / "test_4" / "manifest.json")
+    assert not os.path.exists(tmp_path / "test_0" / "manifest.json")
+
+
+def test_capture_survives_a_dead_chromedriver(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    # What selenium raises unwrapped when chromedriver is gone
+    directory = store.capture(FakeDriver(error=MaxRetryError(None, "/session", "refused")), "test_dead")
+    store.close()
+
+    assert os.path.exists(os.path.join(directory, "manifest.json"))
+
+
+def test_a_test_failing_again_overwrites_its_artifacts(tmp_path):
+    store = ArtifactStore(str(tmp_path), workers=1)
+    first = store.capture(FakeDriver(dom="<html>first</html>"), "test_rerun")
+    store.capture(FakeDriver(dom="<html>second</html>"), "test_rerun")
+    store.close()
+
+    assert len(os.listdir(tmp_path / "dom")) == 2
+    with open(os.path.join(first, "manifest.json")) as manifest:
+        dom_path = json.load(manifest)["dom"]
+    with gzip.open(dom_path) as dom:
+        assert dom.read() == b"<html>second</html>"
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from utils.benchmark import ScenarioBenchmark
+from utils.locator_benchmark import css_to_xpath
+from utils.steps import page_steps
+
+
+class FakeDriver:
+    def execute(self, command, params=None):
+        return {"value": None}
+
+
+@page_steps
+class FakeJobsPage:
+    def filter_location(self, seconds):
+        time.sleep(seconds)
+
+    def validate_all_jobs(self, seconds):
+        time.sleep(seconds)
+
+
+def benchmark_with_medians(medians):
+    benchmark = ScenarioBenchmark(tolerance=0.2, min_delta=0.05)
+    for phase, seconds in medians.items():
+        benchmark.start_round("scenario")
+        benchmark.record(phase, seconds)
+        benchmark.finish_round()
+    return benchmark
+
+
+def test_compare_flags_only_phases_slower_than_tolerance_and_min_delta():
+    baseline = {"scenarios": {"scenario": {
+        "navigation": {"median": 1.0},
+        "filtering": {"median": 1.0},
+        "validation": {"median": 0.1},
+    }}}
+    benchmark = benchmark_with_medians({
+        "navigation": 1.3,   # 30% and 0.3s slower: regression
+        "filtering": 1.1,    # within the 20% tolerance
+        "validation": 0.14,  # 40% slower but only 0.04s
+        "teardown": 9.0,     # not in the baseline
+    })
+
+    regressions = benchmark.compare(baseline)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("scenario navigation:")
+
+
+def test_concurrent_threads_are_charged_to_their_own_phases():
+    benchmark = ScenarioBenchmark()
+    benchmark.start_round("scenario")
+    benchmark.attach(FakeDriver())
+    page = FakeJobsPage()
+
+    # One thread is filtering while the other is validating, like two tabs of TabExecutor
+    threads = [
+        threading.Thread(target=page.filter_location, args=(0.2,)),
+        threading.Thread(target=page.validate_all_jobs, args=(0.1,)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    benchmark.detach()
+    benchmark.finish_round()
+
+    phases = benchmark.rounds[0]["phases"]
+    assert 0.2 <= phases["filtering"] < 0.3
+    assert 0.1 <= phases["validation"] < 0.2
+
+
+def test_css_to_xpath_translates_simple_selectors_only():
+    assert css_to_xpath("div#main a.btn") == (
+        "//div[@id='main']//a[contains(concat(' ', normalize-space(@class), ' '), ' btn ')]"
+    )
+    assert css_to_xpath("div > a") is None
+    assert css_to_xpath("a[href]") is None
@@ -6,7 +6,9 @@ from selenium.webdriver.common.action_chains import ActionChains
 from pages.home_page import HomePage
 from pages.careers_page import CareersPage
 from pages.qa_page import QAJobsPage
-import time
+from pages.journey import Journey
+from utils.lever_api import filter_records
+from utils.tab_executor import TabExecutor
 
 # -------------------
 # Scenario 1: Insider home page open check
@@ -35,42 +37,15 @@ def test_home_page_opens(driver):
 # -------------------
 def test_careers_visibility(driver):
     print("\n=== Scenario 2: Careers visibility ===")
-    home = HomePage(driver)
-    
-    print("Opening Insider home page...")
-    home.open()
-    print("Declining cookies if present...")
-    home.decline_cookies_if_present()
-    
-    print("Navigating to Careers page...")
-    home.go_to_careers()
-    
+    print("Navigating to Careers page and expanding all teams...")
+    Journey(driver).reach("all_teams")
     careers = CareersPage(driver)
-    print("Clicking 'See all teams'...")
-    careers.click_see_all_teams()
-    
-    print("Checking visibility of Finance team...")
-    assert careers.is_finance_visible()
-    print("Finance team is visible.")
     
-    print("Checking visibility of Marketing team...")
-    assert careers.is_marketing_visible()
-    print("Marketing team is visible.")
-    
-    print("Checking visibility of CEO team...")
-    assert careers.is_ceo_visible()
-    print("CEO team is visible.")
-    
-    print("Checking visibility of Locations section...")
-    assert careers.is_locations_visible()
-    print("Locations title is visible.")
-    
-    assert careers.is_locations_desc_visible()
-    print("Locations description is visible.")
-    
-    print("Checking visibility of 'Life at Insider' section...")
-    assert careers.is_life_visible()
-    print("'Life at Insider' section is visible.")
+    print("Checking visibility of Finance, Marketing, CEO, Locations and 'Life at Insider' sections...")
+    visible = careers.sections_visibility()
+    missing = [name for name, is_visible in visible.items() if not is_visible]
+    assert not missing, f"Careers sections not visible: {', '.join(missing)}"
+    print("All careers sections are visible.")
     
     print("Scenario 2 completed.\n")
 
@@ -79,33 +54,9 @@ def test_careers_visibility(driver):
 # -------------------
 def test_qa_jobs_filters(driver):
     print("\n=== Scenario 3: QA jobs filters ===")
-    home = HomePage(driver)
-    
-    print("Opening Insider home page...")
-    home.open()
-    print("Declining cookies if present...")
-    home.decline_cookies_if_present()
-    
-    print("Navigating to Careers page...")
-    home.go_to_careers()
-    
-    careers = CareersPage(driver)
-    print("Clicking 'See all teams'...")
-    careers.click_see_all_teams()
-    print("Clicking QA team...")
-    careers.click_qa_team()
-    
+    print("Navigating to QA jobs filtered by Location=Istanbul, Turkiye, Department=Quality Assurance...")
+    Journey(driver).reach("qa_jobs_filtered")
     qa_page = QAJobsPage(driver)
-    print("Clicking 'See all QA jobs'...")
-    qa_page.click_see_all_qa_jobs()
-    
-    print("Waiting for job list to load...")
-    time.sleep(10)
-    
-    print("Filtering by location: Istanbul, Turkiye")
-    qa_page.filter_location("Istanbul, Turkiye")
-    print("Filtering by department: Quality Assurance")
-    qa_page.filter_department("Quality Assurance")
     
     print("Scrolling job list...")
     qa_page.scroll_job_list()
@@ -119,41 +70,37 @@ def test_qa_jobs_filters(driver):
 # -------------------
 # Scenario 4: Validate all job listings
 # -------------------
-def test_validate_all_jobs(driver):
+def test_validate_all_jobs(driver, job_postings):
     print("\n=== Scenario 4: Validate all job listings ===")
-    home = HomePage(driver)
-    
-    print("Opening Insider home page...")
-    home.open()
-    print("Declining cookies if present...")
-    home.decline_cookies_if_present()
-    print("Navigating to Careers page...")
-    home.go_to_careers()
-    
-    careers = CareersPage(driver)
-    print("Clicking 'See all teams'...")
-    careers.click_see_all_teams()
-    print("Clicking QA team...")
-    careers.click_qa_team()
-    
+    if job_postings is not None:
+        print("Validating all Lever postings for Location=Istanbul, Turkiye, Department=Quality Assurance...")
+        expected = filter_records(job_postings, "Quality Assurance", "Istanbul, Turkiye")
+        assert expected, "No Lever postings match the filters!"
+        mismatches = QAJobsPage.find_job_mismatches(expected, "Quality Assurance", "Quality Assurance", "Istanbul, Turkiye")
+        assert not mismatches, "Lever postings do not match the filters:\n" + "\n".join(mismatches)
+        print(f"All {len(expected)} Lever postings match the expected filters.")
+
+    print("Navigating to the QA jobs list...")
+    Journey(driver).reach("qa_jobs")
     qa_page = QAJobsPage(driver)
-    print("Clicking 'See all QA jobs'...")
-    qa_page.click_see_all_qa_jobs()
-    
-    print("Waiting for job list to load...")
-    time.sleep(10)
-    
+
+    # Department first, the reverse of the qa_jobs_filtered checkpoint, so both orders stay covered
     print("Applying filters: Department=Quality Assurance, Location=Istanbul, Turkiye")
     qa_page.filter_department("Quality Assurance")
     qa_page.filter_location("Istanbul, Turkiye")
     
-    print("Validating all job cards match expected filters...")
-    qa_page.validate_all_jobs(
-        expected_position="Quality Assurance",
-        expected_department="Quality Assurance",
-        expected_location="Istanbul, Turkiye"
-    )
-    print("All job cards match the expected filters.")
+    if job_postings is not None:
+        print("Confirming a sample of job cards against the Lever postings...")
+        qa_page.confirm_job_sample(expected)
+        print("Job list matches the Lever postings.")
+    else:
+        print("Validating all job cards match expected filters...")
+        qa_page.validate_all_jobs(
+            expected_position="Quality Assurance",
+            expected_department="Quality Assurance",
+            expected_location="Istanbul, Turkiye"
+        )
+        print("All job cards match the expected filters.")
     
     print("Scenario 4 completed.\n")
 
@@ -162,34 +109,79 @@ def test_validate_all_jobs(driver):
 # -------------------
 def test_view_role_redirects_to_lever(driver):
     print("\n=== Scenario 5: View Role button redirects to Lever ===")
-    home = HomePage(driver)
-    
-    print("Opening Insider home page...")
-    home.open()
-    print("Declining cookies if present...")
-    home.decline_cookies_if_present()
-    print("Navigating to Careers page...")
-    home.go_to_careers()
-    
-    careers = CareersPage(driver)
-    print("Clicking 'See all teams'...")
-    careers.click_see_all_teams()
-    print("Clicking QA team...")
-    careers.click_qa_team()
-    
+    print("Navigating to QA jobs filtered by Location=Istanbul, Turkiye, Department=Quality Assurance...")
+    Journey(driver).reach("qa_jobs_filtered")
     qa_page = QAJobsPage(driver)
-    print("Clicking 'See all QA jobs'...")
-    qa_page.click_see_all_qa_jobs()
-    
-    print("Waiting for job list to load...")
-    time.sleep(10)
-    
-    print("Applying filters: Location=Istanbul, Turkiye, Department=Quality Assurance")
-    qa_page.filter_location("Istanbul, Turkiye")
-    qa_page.filter_department("Quality Assurance")
     
     print("Clicking first 'View Role' button and switching to new tab...")
     qa_page.click_first_view_role_and_switch()
     print("New tab opened and URL contains 'jobs.lever.co'.")
     
     print("Scenario 5 completed.\n")
+
+# -------------------
+# Scenario 6: Careers visibility and QA filters in concurrent tabs of one browser
+# -------------------
+@pytest.mark.launch_profile("multi-tab")
+def test_concurrent_tab_journeys(driver):
+    print("\n=== Scenario 6: Careers visibility and QA filters in concurrent tabs ===")
+
+    def careers_sections(tab_driver):
+        Journey(tab_driver).reach("all_teams")
+        return CareersPage(tab_driver).sections_visibility()
+
+    def qa_filters(tab_driver):
+        Journey(tab_driver).reach("qa_jobs_filtered")
+        qa_page = QAJobsPage(tab_driver)
+        qa_page.scroll_job_list()
+        return qa_page.is_senior_position_visible()
+
+    print("Running both journeys in their own tabs...")
+    results = TabExecutor(driver).run({"careers sections": careers_sections, "qa filters": qa_filters})
+
+    missing = [name for name, is_visible in results["careers sections"].items() if not is_visible]
+    assert not missing, f"Careers sections not visible: {', '.join(missing)}"
+    print("All careers sections are visible.")
+    assert results["qa filters"]
+    print("Senior Software QA Engineer position is visible.")
+
+    print("Scenario 6 completed.\n")
+
+# -------------------
+# Scenario 7: Filter matrix on one loaded QA jobs page
+# -------------------
+def test_filter_matrix(driver, filter_matrix):
+    print("\n=== Scenario 7: Filter matrix on one loaded QA jobs page ===")
+    print("Navigating to the QA jobs list...")
+    Journey(driver).reach("qa_jobs")
+    qa_page = QAJobsPage(driver)
+
+    combinations = filter_matrix["combinations"]
+    if combinations is None:
+        # Only (location, department) options some listed card belongs to, so every combination must show cards
+        options = qa_page.filter_options()
+        cards = qa_page.read_job_records()
+        listed = [
+            (location, department)
+            for location in options["location"]
+            for department in options["department"]
+            if any(not QAJobsPage.find_job_mismatches([card], department, department, location) for card in cards)
+        ]
+        anchor = (Journey.FILTER_LOCATION, Journey.FILTER_DEPARTMENT)
+        assert anchor in listed, f"No listed job for {anchor[0]} / {anchor[1]}"
+        combinations = [anchor] + [combination for combination in listed if combination != anchor][:filter_matrix["size"] - 1]
+    print(f"Checking {len(combinations)} (location, department) combinations on the same page...")
+
+    failures = []
+    for location, department in combinations:
+        qa_page.set_filters(location=location, department=department)
+        records = qa_page.read_job_records()
+        # Position is only required to name the department somewhere, like in scenario 4
+        mismatches = QAJobsPage.find_job_mismatches(records, department, department, location)
+        print(f"{location} / {department}: {len(records)} jobs, {len(mismatches)} mismatches")
+        if not records:
+            failures.append(f"{location} / {department}: no jobs, although the unfiltered list has some")
+        failures += [f"{location} / {department}: {mismatch}" for mismatch in mismatches]
+
+    assert not failures, "Filtered job cards do not match their filters:\n" + "\n".join(failures)
+    print("Scenario 7 completed.\n")
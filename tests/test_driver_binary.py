@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+from utils import driver_binary
+
+
+class FakeDriverManager:
+    """Stands in for webdriver_manager's download, counting how often it is used"""
+
+    downloads = 0
+
+    def __init__(self, download_dir):
+        self.download_dir = download_dir
+
+    def install(self):
+        FakeDriverManager.downloads += 1
+        path = os.path.join(self.download_dir, "chromedriver")
+        with open(path, "wb") as binary:
+            binary.write(b"driver")
+        return path
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.delenv(driver_binary.PINNED_PATH_ENV, raising=False)
+    monkeypatch.setattr(driver_binary, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(driver_binary, "installed_chrome_version", lambda: "126.0.6478.126")
+    monkeypatch.setattr(driver_binary, "ChromeDriverManager", lambda: FakeDriverManager(str(tmp_path)))
+    FakeDriverManager.downloads = 0
+    return tmp_path / "cache"
+
+
+def test_driver_is_downloaded_once_then_served_from_cache(cache):
+    first = driver_binary.resolve_driver_path()
+    assert driver_binary.last_resolution["source"] == "download"
+
+    second = driver_binary.resolve_driver_path()
+
+    assert second == first
+    assert driver_binary.last_resolution["source"] == "cache"
+    assert FakeDriverManager.downloads == 1
+
+
+def test_malformed_index_is_a_cache_miss(cache):
+    index_path = driver_binary._index_path("126.0.6478.126")
+    os.makedirs(os.path.dirname(index_path))
+    with open(index_path, "w") as index_file:
+        json.dump(["not", "an", "entry"], index_file)
+
+    driver_binary.resolve_driver_path()
+
+    assert driver_binary.last_resolution["source"] == "download"
+    assert driver_binary._cached_binary("126.0.6478.126") is not None
+
+
+def test_undetected_chrome_version_fails_without_downloading(cache, monkeypatch):
+    monkeypatch.setattr(driver_binary, "installed_chrome_version", lambda: None)
+
+    with pytest.raises(RuntimeError, match="CHROMEDRIVER_PATH"):
+        driver_binary.resolve_driver_path()
+    assert FakeDriverManager.downloads == 0
+
+
+def test_driver_cached_by_another_worker_while_waiting_for_the_lock_is_reused(cache, tmp_path, monkeypatch):
+    other_worker_download = tmp_path / "other" / "chromedriver"
+    other_worker_download.parent.mkdir()
+    other_worker_download.write_bytes(b"driver")
+
+    class LockHeldByOtherWorker(driver_binary.FileLock):
+        def __enter__(self):
+            # The other worker stores its download before it releases the lock
+            driver_binary._store_binary("126.0.6478.126", str(other_worker_download))
+            return super().__enter__()
+
+    monkeypatch.setattr(driver_binary, "FileLock", LockHeldByOtherWorker)
+
+    driver_binary.resolve_driver_path()
+
+    assert driver_binary.last_resolution["source"] == "cache"
+    assert FakeDriverManager.downloads == 0
+
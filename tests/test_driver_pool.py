@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+from urllib3.exceptions import MaxRetryError
+
+from utils.driver_pool import DriverPool
+
+
+class FakeDriver:
+    """Stands in for a WebDriver; a dead one fails like selenium does when chromedriver crashed"""
+
+    started = 0
+
+    def __init__(self, alive=True):
+        FakeDriver.started += 1
+        self.session_id = f"session-{FakeDriver.started}"
+        self.alive = alive
+        self.quit_calls = 0
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise MaxRetryError(None, "/session", "Connection refused")
+        return 1
+
+    @property
+    def window_handles(self):
+        if not self.alive:
+            raise MaxRetryError(None, "/session", "Connection refused")
+        return ["main"]
+
+    def quit(self):
+        self.quit_calls += 1
+        if not self.alive:
+            raise MaxRetryError(None, "/session", "Connection refused")
+
+
+def test_acquire_recycles_a_session_whose_chromedriver_died():
+    drivers = iter([FakeDriver(alive=False), FakeDriver()])
+    pool = DriverPool(size=1, factory=lambda: next(drivers))
+
+    driver = pool.acquire(timeout=5)
+
+    assert driver.alive
+    pool.close()
+
+
+def test_release_replaces_a_session_that_fails_its_reset():
+    pool = DriverPool(size=1, factory=FakeDriver)
+    driver = pool.acquire(timeout=5)
+    driver.alive = False
+
+    pool.release(driver)
+
+    assert pool.acquire(timeout=5) is not driver
+    assert driver.quit_calls == 1
+    pool.close()
+
+
+def test_acquire_timeout_is_descriptive():
+    pool = DriverPool(size=0)
+
+    with pytest.raises(TimeoutError, match="No browser became available"):
+        pool.acquire(timeout=0.01)
+
+
+class FakeTabsDriver:
+    """Records which windows had their sessionStorage cleared and which CDP storage was cleared"""
+
+    def __init__(self):
+        self.handles = ["main", "lever"]
+        self.current = "main"
+        self.session_cleared = []
+        self.cdp = []
+        self.switch_to = self
+
+    @property
+    def window_handles(self):
+        return list(self.handles)
+
+    def window(self, handle):
+        self.current = handle
+
+    def execute_script(self, script):
+        if "sessionStorage.clear()" in script:
+            self.session_cleared.append(self.current)
+        return f"https://{self.current}.example"
+
+    def close(self):
+        self.handles.remove(self.current)
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+
+    def get(self, url):
+        self.current_url = url
+
+
+def test_reset_clears_session_storage_of_every_window():
+    driver = FakeTabsDriver()
+
+    DriverPool(size=0).reset(driver)
+
+    assert sorted(driver.session_cleared) == ["lever", "main"]
+    assert driver.handles == ["main"]
+    storage_types = {params["storageTypes"] for command, params in driver.cdp if command == "Storage.clearDataForOrigin"}
+    assert storage_types == {DriverPool.STORAGE_TYPES}
+    assert "session_storage" not in DriverPool.STORAGE_TYPES
+
+
+def test_close_does_not_wait_forever_for_a_hung_browser_start():
+    started = threading.Event()
+    hang = threading.Event()
+
+    def hung_factory():
+        started.set()
+        hang.wait()
+        return FakeDriver()
+
+    pool = DriverPool(size=1, factory=hung_factory)
+    started.wait(timeout=5)
+
+    began = time.monotonic()
+    pool.close(timeout=0.2)
+
+    assert time.monotonic() - began < 2
+    hang.set()
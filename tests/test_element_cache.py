@@ -0,0 +1,47 @@
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+from utils.element_cache import CachedElement
+
+JOB_CARDS = (By.CSS_SELECTOR, ".position-list-item")
+
+
+class FakeDriver:
+    """Answers element commands for the current element ids; older ids are stale like after a re-render"""
+
+    def __init__(self, card_ids):
+        self.card_ids = card_ids
+        self.sent_ids = []
+
+    def find_elements(self, by, value):
+        return [WebElement(self, card_id) for card_id in self.card_ids]
+
+    def execute(self, command, params=None):
+        self.sent_ids.append(params["id"])
+        if params["id"] not in self.card_ids:
+            raise StaleElementReferenceException("stale element reference")
+        return {"value": f"text of {params['id']}"}
+
+
+def test_stale_element_is_found_again_by_locator_and_index_and_retried_with_the_new_id():
+    driver = FakeDriver(["old-0", "old-1"])
+    element = CachedElement(driver, "old-1", JOB_CARDS, index=1)
+    # The job list re-rendered: same cards, new element references
+    driver.card_ids = ["new-0", "new-1"]
+
+    assert element._execute(Command.GET_ELEMENT_TEXT)["value"] == "text of new-1"
+    assert driver.sent_ids == ["old-1", "new-1"]
+    assert element.id == "new-1"
+
+
+def test_stale_element_without_a_match_any_more_raises():
+    driver = FakeDriver(["old-0", "old-1"])
+    element = CachedElement(driver, "old-1", JOB_CARDS, index=1)
+    driver.card_ids = ["new-0"]
+
+    with pytest.raises(StaleElementReferenceException):
+        element._execute(Command.GET_ELEMENT_TEXT)
+    assert driver.sent_ids == ["old-1"]
@@ -0,0 +1,19 @@
+import threading
+import time
+
+import pytest
+
+from utils.file_lock import FileLock
+
+
+def test_file_lock_waits_for_the_holder_and_gives_up_after_its_timeout(tmp_path):
+    path = str(tmp_path / ".lock")
+    holder = FileLock(path).__enter__()
+
+    with pytest.raises(TimeoutError):
+        FileLock(path, timeout=0.3).__enter__()
+
+    threading.Timer(0.5, holder.__exit__, (None, None, None)).start()
+    started = time.monotonic()
+    with FileLock(path, timeout=10):
+        assert time.monotonic() - started >= 0.4
@@ -0,0 +1,25 @@
+import pytest
+from pages.careers_page import CareersPage
+from pages.qa_page import QAJobsPage
+from pages.journey import Journey
+from utils.locator_benchmark import benchmark_page, format_rows
+
+# -------------------
+# Locator lookup latency: XPath vs CSS (benchmark runs only)
+# -------------------
+@pytest.mark.benchmark
+def test_locator_lookup_latency(scenario_benchmark, driver):
+    print("\n=== Locator lookup latency ===")
+    journey = Journey(driver)
+
+    print("Timing CareersPage locators on the expanded teams page...")
+    journey.reach("all_teams")
+    rows = benchmark_page(driver, CareersPage(driver))
+
+    print("Timing QAJobsPage locators on the QA job list...")
+    journey.reach("qa_jobs")
+    rows += benchmark_page(driver, QAJobsPage(driver))
+
+    print(format_rows(rows))
+    scenario_benchmark.locators.extend(rows)
+    print("Locator lookup latency recorded.\n")
@@ -0,0 +1,29 @@
+from utils.parallel_runner import WORKER_ID_ENV, balance_shards, gather_worker_data
+
+
+def test_balance_shards_puts_longest_tests_first():
+    durations = {"a": 5.0, "b": 4.0, "c": 3.0, "d": 3.0, "e": 1.0}
+    shards = balance_shards(list(durations), durations, 2)
+
+    totals = sorted(sum(durations[nodeid] for nodeid in shard) for shard in shards)
+    assert totals == [8.0, 8.0]
+    assert [shard[0] for shard in shards] == ["a", "b"]
+
+
+def test_balance_shards_uses_median_for_unknown_tests():
+    durations = {"a": 10.0, "b": 2.0, "c": 2.0}
+    shards = balance_shards(["a", "b", "c", "new"], durations, 2)
+
+    assert shards[0] == ["a"]
+    assert sorted(shards[1]) == ["b", "c", "new"]
+
+
+def test_gather_worker_data_hands_worker_data_to_the_controller(tmp_path, monkeypatch):
+    path = str(tmp_path / "report.json")
+    for index, samples in enumerate([[1], [2, 3]]):
+        monkeypatch.setenv(WORKER_ID_ENV, str(index))
+        assert gather_worker_data(path, samples) is None
+
+    monkeypatch.delenv(WORKER_ID_ENV)
+    assert gather_worker_data(path, []) == [[1], [2, 3]]
+    assert list(tmp_path.iterdir()) == []
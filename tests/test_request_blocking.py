@@ -0,0 +1,102 @@
+import json
+import threading
+
+from utils.request_blocking import PROFILES, ResourceMonitor
+
+
+class FakeDriver:
+    """Serves queued DevTools events through the performance log"""
+
+    started = 0
+
+    def __init__(self):
+        FakeDriver.started += 1
+        self.session_id = f"blocking-session-{FakeDriver.started}"
+        self.events = []
+
+    def get_log(self, log_type):
+        entries = [{"message": json.dumps({"message": {"method": method, "params": params}})} for method, params in self.events]
+        self.events = []
+        return entries
+
+
+def request(driver, request_id, url, loader_id="page-1"):
+    driver.events.append(("Network.requestWillBeSent", {
+        "requestId": request_id,
+        "loaderId": loader_id,
+        "documentURL": "https://useinsider.com/careers/",
+        "request": {"url": url},
+    }))
+
+
+def loaded(driver, request_id, size):
+    driver.events.append(("Network.loadingFinished", {"requestId": request_id, "encodedDataLength": size}))
+
+
+def blocked(driver, request_id):
+    driver.events.append(("Network.loadingFailed", {"requestId": request_id, "blockedReason": "inspector"}))
+
+
+def test_monitor_counts_loaded_and_blocked_requests_and_remembers_sizes(tmp_path):
+    sizes_file = str(tmp_path / "sizes.json")
+    with open(sizes_file, "w") as sizes:
+        json.dump({"https://www.google-analytics.com/ga.js": 5000}, sizes)
+    driver = FakeDriver()
+    monitor = ResourceMonitor(driver, PROFILES["no-trackers"], sizes_file=sizes_file)
+
+    request(driver, "1", "https://useinsider.com/careers/")
+    loaded(driver, "1", 1200)
+    request(driver, "2", "https://www.google-analytics.com/ga.js")
+    blocked(driver, "2")
+    request(driver, "3", "https://www.hotjar.com/h.js")
+    blocked(driver, "3")
+    totals = monitor.stop()
+
+    assert totals == {
+        "requests_loaded": 1,
+        "bytes_loaded": 1200,
+        "requests_blocked": 2,
+        "bytes_saved": 5000,
+        "blocked_without_size": 1,
+    }
+    with open(sizes_file) as sizes:
+        assert json.load(sizes)["https://useinsider.com/careers/"] == 1200
+
+
+def test_budget_violations_name_the_pages_over_budget(tmp_path):
+    driver = FakeDriver()
+    profile = PROFILES["none"].with_budget(max_requests=2, max_bytes=1000)
+    monitor = ResourceMonitor(driver, profile, sizes_file=str(tmp_path / "sizes.json"))
+
+    for request_id in ("1", "2", "3"):
+        request(driver, request_id, f"https://useinsider.com/{request_id}.js")
+        loaded(driver, request_id, 100)
+    request(driver, "4", "https://jobs.lever.co/useinsider", loader_id="page-2")
+    loaded(driver, "4", 2000)
+    monitor.stop()
+
+    assert monitor.budget_violations() == [
+        "https://useinsider.com/careers/: 3 requests (budget 2)",
+        "https://useinsider.com/careers/: 2000 bytes (budget 1000)",
+    ]
+
+
+def test_parallel_monitors_do_not_lose_each_others_sizes(tmp_path):
+    sizes_file = str(tmp_path / "sizes.json")
+
+    def worker(index):
+        for round_index in range(10):
+            driver = FakeDriver()
+            monitor = ResourceMonitor(driver, PROFILES["none"], sizes_file=sizes_file)
+            request(driver, "1", f"https://useinsider.com/{index}-{round_index}.js")
+            loaded(driver, "1", 10)
+            monitor.stop()
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    with open(sizes_file) as sizes:
+        assert len(json.load(sizes)) == 40
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from utils import proc_stats
+from utils.proc_stats import CLOCK_TICKS, PAGE_SIZE, tree_usage
+from utils.resource_governor import ResourceGovernor
+
+
+def write_stat(proc, pid, ppid, utime=0, stime=0, rss_pages=0, name="chrome"):
+    """Write a /proc/<pid>/stat line: fields 14/15 are utime/stime, field 24 is rss"""
+    fields = ["S", str(ppid)] + ["0"] * 9 + [str(utime), str(stime)] + ["0"] * 8 + [str(rss_pages), "0", "0"]
+    os.makedirs(os.path.join(proc, str(pid)), exist_ok=True)
+    with open(os.path.join(proc, str(pid), "stat"), "w") as stat_file:
+        stat_file.write(f"{pid} ({name}) " + " ".join(fields) + "\n")
+
+
+@pytest.fixture
+def proc(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / "self")
+    monkeypatch.setattr(proc_stats, "PROC", str(tmp_path))
+    return str(tmp_path)
+
+
+MB_PAGES = 1_000_000 // PAGE_SIZE + 1
+
+
+class FakeDriver:
+    """A driver whose chromedriver service runs as pid 100"""
+
+    class service:
+        class process:
+            pid = 100
+
+
+def run_test(proc, governor, rss_mb, cpu_seconds):
+    """Start a test on a small browser, grow it to `rss_mb` and `cpu_seconds`, finish the test"""
+    write_stat(proc, 100, 1, utime=0, rss_pages=0)
+    before = governor.start_test(FakeDriver())
+    write_stat(proc, 100, 1, utime=cpu_seconds * CLOCK_TICKS, rss_pages=rss_mb * MB_PAGES)
+    return governor.finish_test(FakeDriver(), "test_x", before)
+
+
+def test_tree_usage_sums_the_whole_process_tree(proc):
+    write_stat(proc, 100, 1, utime=CLOCK_TICKS, rss_pages=10, name="chromedriver")
+    write_stat(proc, 101, 100, utime=CLOCK_TICKS, stime=CLOCK_TICKS, rss_pages=20)
+    # A renderer two levels down, with a space and a ')' in its name
+    write_stat(proc, 102, 101, stime=CLOCK_TICKS, rss_pages=30, name="chrome (renderer)")
+    write_stat(proc, 200, 1, utime=50 * CLOCK_TICKS, rss_pages=1000, name="other")
+
+    usage = tree_usage(100)
+
+    assert usage == {"pids": 3, "rss_bytes": 60 * PAGE_SIZE, "cpu_seconds": 4.0}
+
+
+def test_tree_usage_is_none_when_the_root_process_is_gone(proc):
+    assert tree_usage(100) is None
+
+
+def test_browser_under_the_limits_is_kept_and_its_deltas_recorded(proc):
+    governor = ResourceGovernor(max_rss_mb=500, max_cpu_seconds=60)
+
+    sample = run_test(proc, governor, rss_mb=100, cpu_seconds=10)
+
+    assert sample["recycled"] is None
+    assert sample["rss_delta_bytes"] > 100_000_000
+    assert sample["cpu_delta_seconds"] == 10
+    assert governor.samples == [sample]
+
+
+def test_rss_limit_is_reported_before_the_cpu_limit(proc):
+    governor = ResourceGovernor(max_rss_mb=500, max_cpu_seconds=60)
+
+    assert run_test(proc, governor, rss_mb=600, cpu_seconds=100)["recycled"].startswith("RSS")
+    assert run_test(proc, governor, rss_mb=100, cpu_seconds=100)["recycled"] == "CPU 100s > 60s"
+
+
+def test_governor_without_limits_never_recycles(proc):
+    assert run_test(proc, ResourceGovernor(), rss_mb=5000, cpu_seconds=5000)["recycled"] is None
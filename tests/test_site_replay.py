@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import urllib.request
+
+import pytest
+
+from utils.site_replay import ReplayServer, _key_hash
+
+
+def capture(capture_dir, url, body, content_type="text/html", status=200):
+    """Write one entry the way SiteRecorder stores it"""
+    body = body.encode()
+    body_hash = hashlib.sha256(body).hexdigest()
+    os.makedirs(os.path.join(capture_dir, "entries"), exist_ok=True)
+    os.makedirs(os.path.join(capture_dir, "bodies"), exist_ok=True)
+    with open(os.path.join(capture_dir, "bodies", body_hash), "wb") as body_file:
+        body_file.write(body)
+    entry = {"method": "GET", "url": url, "status": status, "content_type": content_type, "body": body_hash}
+    with open(os.path.join(capture_dir, "entries", _key_hash("GET", url) + ".json"), "w") as entry_file:
+        json.dump(entry, entry_file)
+
+
+@pytest.fixture
+def server(tmp_path):
+    capture_dir = str(tmp_path)
+    capture(capture_dir, "https://useinsider.com/careers/", '<a href="https://jobs.lever.co/useinsider/1">View Role</a>')
+    capture(capture_dir, "https://jobs.lever.co/useinsider/1", "<h2>QA Engineer</h2>")
+    capture(capture_dir, "https://jobs.lever.co/css/lever.css", "h2 {}", content_type="text/css")
+    capture(capture_dir, "https://useinsider.com/app.js", "v1", content_type="application/javascript")
+    server = ReplayServer(capture_dir).start()
+    yield server
+    server.stop()
+
+
+def test_url_for_and_live_url_map_every_host_both_ways(server):
+    local = server.url_for("https://jobs.lever.co/useinsider/1?lever-origin=applied")
+
+    assert local == f"{server.base_url}/_host/jobs.lever.co/useinsider/1?lever-origin=applied"
+    assert server.url_for("https://useinsider.com/careers/") == f"{server.base_url}/careers/"
+    assert server.live_url("/_host/jobs.lever.co/useinsider/1") == "https://jobs.lever.co/useinsider/1"
+    assert server.live_url("/careers/") == "https://useinsider.com/careers/"
+
+
+def test_root_relative_paths_of_another_host_resolve_against_the_referer(server):
+    referer = f"{server.base_url}/_host/jobs.lever.co/useinsider/1"
+
+    assert server.live_url("/css/lever.css", referer) == "https://jobs.lever.co/css/lever.css"
+    assert server.live_url("/careers/", f"{server.base_url}/careers/") == "https://useinsider.com/careers/"
+
+    request = urllib.request.Request(f"{server.base_url}/css/lever.css", headers={"Referer": referer})
+    with urllib.request.urlopen(request) as response:
+        assert response.read() == b"h2 {}"
+
+
+def test_rewrite_covers_plain_json_escaped_and_protocol_relative_links(server):
+    text = 'https://useinsider.com/a "https:\\/\\/jobs.lever.co\\/x" //useinsider.com/b'
+
+    rewritten = server.rewrite(text)
+
+    local_host = server.base_url.split("://", 1)[1]
+    escaped_lever = f"{server.base_url}/_host/jobs.lever.co".replace("/", "\\/")
+    assert rewritten == f'{server.base_url}/a "{escaped_lever}\\/x" //{local_host}/b'
+
+
+def test_rewrite_leaves_longer_host_names_alone(server):
+    text = "https://useinsider.com.tr/ https://useinsider.community //useinsider.com.tr/x https://useinsider.com"
+
+    assert server.rewrite(text) == (
+        f"https://useinsider.com.tr/ https://useinsider.community //useinsider.com.tr/x {server.base_url}"
+    )
+
+
+def test_lookup_falls_back_to_the_url_without_query(server):
+    entry, body = server.lookup("GET", "https://useinsider.com/app.js?ver=123")
+
+    assert entry["url"] == "https://useinsider.com/app.js"
+    assert body == b"v1"
+    assert server.lookup("GET", "https://useinsider.com/missing.js") == (None, None)
+
+
+def test_server_serves_captures_with_links_rewritten(server):
+    with urllib.request.urlopen(server.url_for("https://useinsider.com/careers/")) as response:
+        page = response.read().decode()
+
+    assert f'href="{server.base_url}/_host/jobs.lever.co/useinsider/1"' in page
@@ -0,0 +1,115 @@
+import threading
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+from utils.element_cache import ElementCache
+from utils.tab_executor import TabExecutor, current_tab
+
+
+class FakeBrowser:
+    """One browser session: a click opens a window from the current one, like View Role"""
+
+    def __init__(self, devtools=False):
+        self.openers = {"home": None}
+        self.current = "home"
+        self.opened = 0
+        self.switch_to = self
+        self.late_opener = None
+        if devtools:
+            self.execute_cdp_cmd = self._execute_cdp_cmd
+
+    def _open(self, opener):
+        self.opened += 1
+        handle = f"window-{self.opened}"
+        self.openers[handle] = opener
+        return handle
+
+    def execute(self, command, params=None):
+        if self.late_opener is not None:
+            # A window.open() that lands after the click that triggered it returned
+            self._open(self.late_opener)
+            self.late_opener = None
+        if command == Command.NEW_WINDOW:
+            return {"value": {"handle": self._open(None)}}
+        if command == Command.SWITCH_TO_WINDOW:
+            self.current = params["handle"]
+        elif command == Command.W3C_GET_CURRENT_WINDOW_HANDLE:
+            return {"value": self.current}
+        elif command == Command.W3C_GET_WINDOW_HANDLES:
+            return {"value": list(self.openers)}
+        elif command == Command.CLOSE:
+            del self.openers[self.current]
+        elif command == Command.CLICK_ELEMENT:
+            self._open(self.current)
+        return {"value": None}
+
+    def _execute_cdp_cmd(self, command, params):
+        if command == "Target.getTargets":
+            return {"targetInfos": [{"targetId": handle, "openerId": opener} for handle, opener in self.openers.items()]}
+        return {}
+
+    @property
+    def current_window_handle(self):
+        return self.execute(Command.W3C_GET_CURRENT_WINDOW_HANDLE)["value"]
+
+    @property
+    def window_handles(self):
+        return self.execute(Command.W3C_GET_WINDOW_HANDLES)["value"]
+
+    def window(self, handle):
+        self.execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+
+
+def run_view_role_race(browser, click):
+    """Tab A opens a window; tab B lists its windows before A looks for the new one"""
+    clicked = threading.Event()
+    listed = threading.Event()
+
+    def opener(driver):
+        click(driver)
+        clicked.set()
+        listed.wait(timeout=5)
+        return len(driver.window_handles)
+
+    def bystander(driver):
+        clicked.wait(timeout=5)
+        count = len(driver.window_handles)
+        listed.set()
+        return count
+
+    return TabExecutor(browser).run({"opener": opener, "bystander": bystander})
+
+
+def test_a_window_belongs_to_the_tab_whose_command_opened_it():
+    browser = FakeBrowser()
+
+    results = run_view_role_race(browser, lambda driver: driver.execute(Command.CLICK_ELEMENT, {"id": "view-role"}))
+
+    assert results == {"opener": 2, "bystander": 1}
+
+
+def test_a_late_window_goes_to_the_tab_of_its_opener():
+    browser = FakeBrowser(devtools=True)
+
+    def click(driver):
+        # The window appears during the next command, which is the other tab's
+        browser.late_opener = current_tab().handle
+
+    results = run_view_role_race(browser, click)
+
+    assert results == {"opener": 2, "bystander": 1}
+
+
+def test_closing_a_tab_drops_the_elements_it_cached():
+    browser = FakeBrowser()
+    cache = ElementCache.for_driver(browser)
+    locator = (By.CSS_SELECTOR, ".position-list-item")
+
+    def journey(driver):
+        cache.put(locator, WebElement(driver, "card-1"))
+        return cache.get(locator) is not None
+
+    assert TabExecutor(browser).run({"qa filters": journey}) == {"qa filters": True}
+    assert cache._elements == {}
@@ -0,0 +1,19 @@
+import pytest
+
+from utils.web_metrics import parse_thresholds, percentile
+
+
+def test_parse_thresholds_reads_metric_limits():
+    assert parse_thresholds(["lcp_ms=2500", "js_heap_used_mb=150.5"]) == {"lcp_ms": 2500.0, "js_heap_used_mb": 150.5}
+    assert parse_thresholds(None) == {}
+
+
+@pytest.mark.parametrize("value", ["lcp=2500", "lcp_ms", "lcp_ms=", "lcp_ms=fast"])
+def test_parse_thresholds_rejects_unknown_metrics_and_bad_limits(value):
+    with pytest.raises(ValueError):
+        parse_thresholds([value])
+
+
+def test_percentile_picks_the_nearest_rank():
+    assert percentile([5, 1, 3, 2, 4], 0.5) == 3
+    assert percentile([5, 1, 3, 2, 4], 0.95) == 5
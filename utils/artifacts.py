@@ -0,0 +1,135 @@
+"""
+Failure artifacts: screenshot, DOM, console log and network log of a failed test.
+
+`capture()` only does what needs the browser (one round trip per artifact) and
+returns; decoding, compressing and writing happen on a small background thread
+pool. DOM snapshots are stored once per content hash, so the same page failing
+in several tests costs one file. The artifacts of a run are capped in size: the
+least recently written or reused files are evicted first.
+
+Layout under the artifacts directory:
+    <test>/screenshot.png, console.json.gz, network.json.gz, manifest.json
+    dom/<sha256>.html.gz
+"""
+import base64
+import collections
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_ARTIFACTS_DIR = "artifacts"
+
+# Resource Timing entries of the current document, a light network log that needs no logging prefs
+NETWORK_LOG_JS = """
+return performance.getEntriesByType('resource').map((entry) => ({
+    url: entry.name,
+    type: entry.initiatorType,
+    start_ms: entry.startTime,
+    duration_ms: entry.duration,
+    transfer_bytes: entry.transferSize,
+    status: entry.responseStatus,
+}));
+"""
+
+
+class ArtifactStore:
+    """Write failure artifacts in the background, deduplicated and size-capped"""
+
+    def __init__(self, root=DEFAULT_ARTIFACTS_DIR, max_bytes=200_000_000, workers=2):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifacts")
+        self._lock = threading.Lock()
+        # path -> size, least recently used first
+        self._files = collections.OrderedDict()
+        self._total_bytes = 0
+
+    # -------------------
+    # Capture (test thread)
+    # -------------------
+
+    def capture(self, driver, test_name):
+        """Grab the raw artifacts from the browser and queue them; returns the test's artifact dir"""
+        raw = {"test": test_name, "url": None, "captured_at": time.time()}
+        for key, grab in (
+            ("url", lambda: driver.current_url),
+            ("screenshot", driver.get_screenshot_as_base64),
+            ("dom", lambda: driver.page_source),
+            ("console", lambda: driver.get_log("browser")),
+            ("network", lambda: driver.execute_script(NETWORK_LOG_JS)),
+        ):
+            try:
+                raw[key] = grab()
+            except Exception as error:
+                # A dead window, a missing log type or a dead chromedriver (urllib3 errors
+                # are not wrapped by selenium) must not hide the test failure
+                raw[key] = None
+                raw.setdefault("errors", {})[key] = getattr(error, "msg", None) or repr(error)
+
+        directory = os.path.join(self.root, re.sub(r"[^\w.-]", "_", test_name.replace("::", "__")))
+        self._executor.submit(self._write, directory, raw)
+        return directory
+
+    def close(self):
+        """Wait for the queued artifacts to be written"""
+        self._executor.shutdown(wait=True)
+
+    # -------------------
+    # Writing (background threads)
+    # -------------------
+
+    def _write(self, directory, raw):
+        os.makedirs(directory, exist_ok=True)
+        manifest = {key: raw.get(key) for key in ("test", "url", "captured_at", "errors") if raw.get(key)}
+
+        if raw.get("screenshot"):
+            manifest["screenshot"] = self._store(os.path.join(directory, "screenshot.png"), base64.b64decode(raw["screenshot"]))
+        if raw.get("dom") is not None:
+            dom = raw["dom"].encode("utf-8")
+            digest = hashlib.sha256(dom).hexdigest()
+            manifest["dom"] = self._store(os.path.join(self.root, "dom", f"{digest}.html.gz"), dom, compress=True, dedupe=True)
+        for key in ("console", "network"):
+            if raw.get(key) is not None:
+                data = json.dumps(raw[key], indent=1).encode("utf-8")
+                manifest[key] = self._store(os.path.join(directory, f"{key}.json.gz"), data, compress=True)
+
+        self._store(os.path.join(directory, "manifest.json"), json.dumps(manifest, indent=2).encode("utf-8"))
+
+    def _store(self, path, data, compress=False, dedupe=False):
+        """Write one file, or reuse a content-addressed one stored already; returns its path"""
+        with self._lock:
+            if dedupe and path in self._files:
+                # Deduplicated (content-addressed) file: reuse it and mark it recently used
+                self._files.move_to_end(path)
+                return path
+
+        if compress:
+            data = gzip.compress(data, compresslevel=6)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as artifact_file:
+            artifact_file.write(data)
+        os.replace(temporary_path, path)
+
+        with self._lock:
+            self._total_bytes += len(data) - self._files.pop(path, 0)
+            self._files[path] = len(data)
+            self._evict(keep=path)
+        return path
+
+    def _evict(self, keep):
+        while self._total_bytes > self.max_bytes and len(self._files) > 1:
+            path, size = next(iter(self._files.items()))
+            if path == keep:
+                break
+            del self._files[path]
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,233 @@
+"""
+Scenario benchmark with baseline regression gates.
+
+Every scenario runs one discarded warm-up round (it fills the pooled browser's
+journey checkpoints and HTTP cache, so all measured rounds start warm) and then
+--benchmark-rounds times against the local replay site. Each round is split
+into phases:
+- driver_start: taking a browser from the pool (or starting one),
+- navigation, filtering, validation: time spent in page-object steps, by step name,
+- teardown: recorder/monitor shutdown and handing the browser back,
+- other: the rest of the test body (prints, assertions, journey bookkeeping).
+
+Each thread keeps its own phase stack, so journeys running in concurrent tabs
+(TabExecutor) are charged to their own phases; their times add up across tabs
+and the test thread's wait for them counts as other.
+
+The median and p95 of every phase are written to a results file, can be saved as
+the baseline and are compared against it on later runs: a phase fails the run when
+its median is slower than the baseline by more than the tolerance.
+"""
+import json
+import os
+import re
+import statistics
+import threading
+import time
+
+from selenium.webdriver.remote.command import Command
+
+from utils.command_hooks import add_command_hook, remove_command_hook
+from utils.steps import add_step_listener, remove_step_listener
+from utils.web_metrics import percentile
+
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+DEFAULT_RESULTS = ".benchmark_results.json"
+
+PHASES = ["driver_start", "navigation", "filtering", "validation", "teardown", "other"]
+
+# Page-object steps by name; other steps inherit the phase of the step that called them
+STEP_PHASES = {
+    "open": "navigation",
+    "decline_cookies_if_present": "navigation",
+    "go_to_careers": "navigation",
+    "click_see_all_teams": "navigation",
+    "click_qa_team": "navigation",
+    "click_see_all_qa_jobs": "navigation",
+    "wait_for_job_list": "navigation",
+    "filter_location": "filtering",
+    "filter_department": "filtering",
+    "scroll_job_list": "filtering",
+    "set_filters": "filtering",
+    "get_job_records": "validation",
+    "read_job_records": "validation",
+    "validate_all_jobs": "validation",
+    "sections_visibility": "validation",
+    "visibility_map": "validation",
+    "click_first_view_role_and_switch": "validation",
+}
+
+
+def step_phase(step):
+    if step.name in STEP_PHASES:
+        return STEP_PHASES[step.name]
+    if step.name.startswith("is_"):
+        return "validation"
+    return None
+
+
+def round_id(index):
+    """Test id of benchmark round `index`; round 0 is the discarded warm-up"""
+    return f"bench{index}" if index else "warmup"
+
+
+def is_warmup(item):
+    callspec = getattr(item, "callspec", None)
+    return callspec is not None and callspec.params.get("bench_round") == 0
+
+
+def scenario_name(item):
+    """Node id of a test without its benchmark round, e.g. tests/test_careers.py::test_home_page_opens"""
+    callspec = getattr(item, "callspec", None)
+    if callspec is None or "bench_round" not in callspec.params:
+        return item.nodeid
+    ids = [part for part in callspec.id.split("-") if not re.fullmatch(r"bench\d+|warmup", part)]
+    name = item.nodeid[:item.nodeid.index("[")]
+    return f"{name}[{'-'.join(ids)}]" if ids else name
+
+
+class ScenarioBenchmark:
+    """Phase timings of every benchmark round of a run"""
+
+    def __init__(self, tolerance=0.2, min_delta=0.05):
+        # A phase regresses when its median is over baseline * (1 + tolerance) and slower by min_delta seconds
+        self.tolerance = tolerance
+        self.min_delta = min_delta
+        self.rounds = []
+        self.locators = []
+        self._round = None
+        self._driver = None
+        self._lock = threading.Lock()
+        # Phase stack and last step boundary of every thread running steps
+        self._timelines = threading.local()
+
+    # -------------------
+    # Round Recording
+    # -------------------
+
+    def start_round(self, scenario):
+        self._round = {"scenario": scenario, "phases": {}}
+
+    def record(self, phase, seconds):
+        with self._lock:
+            phases = self._round["phases"]
+            phases[phase] = phases.get(phase, 0.0) + seconds
+
+    def finish_round(self):
+        self.rounds.append(self._round)
+        self._round = None
+
+    def attach(self, driver):
+        """Start charging the test body to phases"""
+        self._driver = driver
+        self._timelines = threading.local()
+        self._timeline()
+        add_step_listener(self)
+        add_command_hook(driver, self._time_navigation)
+
+    def detach(self):
+        self._charge(self._timeline())
+        remove_step_listener(self)
+        remove_command_hook(self._driver, self._time_navigation)
+        self._driver = None
+
+    def step_started(self, step):
+        self._enter(step_phase(step))
+
+    def step_finished(self, step, error):
+        self._leave()
+
+    def _time_navigation(self, command, params, call):
+        # Deep links outside page objects (journey restores) are navigation too
+        if command != Command.GET:
+            return call()
+        self._enter("navigation")
+        try:
+            return call()
+        finally:
+            self._leave()
+
+    def _timeline(self):
+        """The calling thread's phase stack; a tab's thread starts its own on its first step"""
+        timeline = self._timelines
+        if not hasattr(timeline, "stack"):
+            timeline.stack = []
+            timeline.since = time.perf_counter()
+        return timeline
+
+    def _enter(self, phase):
+        timeline = self._timeline()
+        self._charge(timeline)
+        timeline.stack.append(phase)
+
+    def _leave(self):
+        timeline = self._timeline()
+        self._charge(timeline)
+        timeline.stack.pop()
+
+    def _charge(self, timeline):
+        """Add the time since the thread's last step boundary to the phase that was running"""
+        now = time.perf_counter()
+        phase = next((phase for phase in reversed(timeline.stack) if phase is not None), "other")
+        self.record(phase, now - timeline.since)
+        timeline.since = now
+
+    # -------------------
+    # Results and Baseline
+    # -------------------
+
+    def summary(self):
+        """Median, p95 and number of rounds of every phase per scenario"""
+        timings = {}
+        for benchmark_round in self.rounds:
+            scenario = timings.setdefault(benchmark_round["scenario"], {})
+            for phase, seconds in benchmark_round["phases"].items():
+                scenario.setdefault(phase, []).append(seconds)
+
+        summary = {}
+        for scenario, phases in sorted(timings.items()):
+            summary[scenario] = {
+                phase: {"median": statistics.median(values), "p95": percentile(values, 0.95), "rounds": len(values)}
+                for phase, values in sorted(phases.items(), key=lambda item: PHASES.index(item[0]))
+            }
+        return summary
+
+    def compare(self, baseline):
+        """Return a readable line for every phase slower than the baseline allows"""
+        regressions = []
+        for scenario, phases in self.summary().items():
+            for phase, current in phases.items():
+                previous = baseline.get("scenarios", {}).get(scenario, {}).get(phase)
+                if previous is None:
+                    continue
+                limit = previous["median"] * (1 + self.tolerance)
+                if current["median"] > limit and current["median"] - previous["median"] > self.min_delta:
+                    regressions.append(
+                        f"{scenario} {phase}: median {current['median']:.3f}s > "
+                        f"{previous['median']:.3f}s baseline +{self.tolerance:.0%}"
+                    )
+        return regressions
+
+    def write_results(self, path):
+        results = {"scenarios": self.summary(), "locators": self.locators}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as results_file:
+            json.dump(results, results_file, indent=2)
+        return results
+
+    @staticmethod
+    def load_baseline(path):
+        if not os.path.exists(path):
+            return None
+        with open(path) as baseline_file:
+            return json.load(baseline_file)
+
+    def format_summary(self):
+        lines = []
+        for scenario, phases in self.summary().items():
+            lines.append(scenario)
+            for phase, timing in phases.items():
+                lines.append(f"  {phase:<13} median {timing['median']:.3f}s  p95 {timing['p95']:.3f}s  ({timing['rounds']} rounds)")
+        return "\n".join(lines)
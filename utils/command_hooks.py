@@ -0,0 +1,52 @@
+import threading
+
+# Set while a hook runs, so WebDriver commands issued by the hook itself bypass the hooks
+_in_hook = threading.local()
+
+
+def add_command_hook(driver, hook):
+    """
+    Run `hook(command, params, call)` around every WebDriver command of `driver`.
+
+    `call()` runs the remaining hooks and the command itself and returns its response.
+    The hook sees commands sent through the driver and through its WebElements
+    (they all go through `driver.execute`). Hooks added later run outermost.
+    """
+    hooks = driver.__dict__.get("_command_hooks")
+    if hooks is None:
+        hooks = driver._command_hooks = []
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            if getattr(_in_hook, "active", False) or not hooks:
+                return original_execute(driver_command, params)
+            return _dispatch(list(reversed(hooks)), original_execute, driver_command, params)
+
+        driver.execute = execute
+    hooks.append(hook)
+
+
+def remove_command_hook(driver, hook):
+    hooks = driver.__dict__.get("_command_hooks", [])
+    if hook in hooks:
+        hooks.remove(hook)
+
+
+def _dispatch(hooks, original_execute, driver_command, params):
+    if not hooks:
+        return original_execute(driver_command, params)
+
+    hook, rest = hooks[0], hooks[1:]
+
+    def call():
+        _in_hook.active = False
+        try:
+            return _dispatch(rest, original_execute, driver_command, params)
+        finally:
+            _in_hook.active = True
+
+    _in_hook.active = True
+    try:
+        return hook(driver_command, params, call)
+    finally:
+        _in_hook.active = False
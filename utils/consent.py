@@ -0,0 +1,50 @@
+"""
+Cookie consent state of the Insider site.
+
+useinsider.com shows the CookieLawInfo (GDPR Cookie Consent) banner until its
+consent cookies are set. Seeding the cookies of a declined consent before the
+first navigation makes the site skip the banner, so no test waits for it.
+
+The consent is seeded per test over DevTools rather than kept in a pre-seeded
+browser profile directory: the driver pool clears every cookie between tests
+(Network.clearBrowserCookies), which would wipe a profile's stored consent after
+the first test, and the replay site's URL changes from run to run. One
+Network.setCookies call before the first navigation gives fresh, pooled and
+persistent-profile browsers the same seeded state.
+"""
+from urllib.parse import urlsplit
+
+# What CookieLawInfo stores when a visitor clicks "Decline"
+DECLINED_CONSENT_COOKIES = {
+    "viewed_cookie_policy": "no",
+    "cookielawinfo-checkbox-necessary": "yes",
+    "cookielawinfo-checkbox-functional": "no",
+    "cookielawinfo-checkbox-performance": "no",
+    "cookielawinfo-checkbox-analytics": "no",
+    "cookielawinfo-checkbox-advertisement": "no",
+    "cookielawinfo-checkbox-others": "no",
+}
+
+
+def seed_consent(driver, url, cookies=None):
+    """
+    Set the consent cookies for the site of `url` without loading it (one DevTools call).
+    Returns False when the driver has no DevTools access.
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+    driver.execute_cdp_cmd(
+        "Network.setCookies",
+        {"cookies": [{"name": name, "value": value, "url": url} for name, value in (cookies or DECLINED_CONSENT_COOKIES).items()]},
+    )
+    print(f"Seeded cookie consent for {urlsplit(url).hostname}")
+    return True
+
+
+def clear_consent(driver, url):
+    """Remove the consent cookies, e.g. left in a persistent profile, so the real banner shows"""
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+    for name in DECLINED_CONSENT_COOKIES:
+        driver.execute_cdp_cmd("Network.deleteCookies", {"name": name, "url": url})
+    return True
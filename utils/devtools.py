@@ -0,0 +1,54 @@
+import json
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+
+class PerformanceLog:
+    """
+    Share Chrome's performance log (DevTools events) between several consumers.
+
+    Reading the log drains it, so every consumer subscribes here and `drain()`
+    hands each event to all subscribers as `callback(method, params)`.
+    The browser must be started with performance logging (see get_driver).
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Return the shared log of a browser session"""
+        with cls._instances_lock:
+            log = cls._instances.get(driver.session_id)
+            if log is None:
+                log = cls._instances[driver.session_id] = cls(driver)
+            return log
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def drain(self):
+        """Read all pending events and dispatch them to the subscribers"""
+        with self._lock:
+            try:
+                entries = self.driver.get_log("performance")
+            except WebDriverException:
+                return
+            subscribers = list(self._subscribers)
+
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            for callback in subscribers:
+                callback(message["method"], message.get("params", {}))
@@ -0,0 +1,149 @@
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+from utils.file_lock import FileLock
+
+# Pinned driver binary, always wins when set
+PINNED_PATH_ENV = "CHROMEDRIVER_PATH"
+CACHE_DIR = os.environ.get(
+    "CHROMEDRIVER_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "qa-chromedriver"),
+)
+
+CHROME_BINARIES = [
+    os.environ.get("CHROME_BINARY", ""),
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+WINDOWS_VERSION_QUERY = ["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"]
+VERSION_PATTERN = re.compile(r"(\d+\.\d+\.\d+\.\d+)")
+
+# Details of the most recent resolution: path, source and seconds spent
+last_resolution = {}
+
+
+@functools.lru_cache(maxsize=None)
+def installed_chrome_version():
+    """
+    Return the locally installed Chrome version (e.g. '126.0.6478.126') without using the network.
+    Detected once per process, since every browser start resolves the driver.
+    """
+    commands = [[binary, "--version"] for binary in CHROME_BINARIES if binary]
+    if sys.platform == "win32":
+        commands.insert(0, WINDOWS_VERSION_QUERY)
+
+    for command in commands:
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = VERSION_PATTERN.search(output)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _index_path(chrome_version):
+    return os.path.join(CACHE_DIR, "versions", f"{chrome_version}.json")
+
+
+def _cached_binary(chrome_version):
+    """Look up the cached driver for a Chrome version, return None on a cache miss"""
+    try:
+        with open(_index_path(chrome_version)) as index_file:
+            entry = json.load(index_file)
+        path = os.path.join(CACHE_DIR, "blobs", entry["sha256"], entry["name"])
+        size = entry["size"]
+    except (OSError, ValueError, KeyError, TypeError):
+        # Missing or malformed index entry: a cache miss, the download rewrites it
+        return None
+
+    if os.path.isfile(path) and os.path.getsize(path) == size:
+        return path
+    return None
+
+
+def _store_binary(chrome_version, downloaded_path):
+    """Copy a downloaded driver into the content-addressed cache and index it by Chrome version"""
+    digest = hashlib.sha256()
+    with open(downloaded_path, "rb") as binary:
+        for chunk in iter(lambda: binary.read(1 << 20), b""):
+            digest.update(chunk)
+    sha256 = digest.hexdigest()
+    name = os.path.basename(downloaded_path)
+
+    blob_dir = os.path.join(CACHE_DIR, "blobs", sha256)
+    os.makedirs(blob_dir, exist_ok=True)
+    path = os.path.join(blob_dir, name)
+    if not os.path.isfile(path):
+        shutil.copy2(downloaded_path, path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    index_path = _index_path(chrome_version)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    with open(index_path + ".tmp", "w") as index_file:
+        json.dump({"sha256": sha256, "name": name, "size": os.path.getsize(path)}, index_file)
+    os.replace(index_path + ".tmp", index_path)
+    return path
+
+
+def _resolve():
+    pinned = os.environ.get(PINNED_PATH_ENV)
+    if pinned:
+        if not os.path.isfile(pinned):
+            raise FileNotFoundError(f"{PINNED_PATH_ENV} points to a missing file: {pinned}")
+        return pinned, "pinned"
+
+    chrome_version = installed_chrome_version()
+    if chrome_version is None:
+        # Nothing to key the cache on; downloading on every browser start is not an option
+        raise RuntimeError(
+            "Could not detect the installed Chrome version to pick a cached ChromeDriver. "
+            f"Set {PINNED_PATH_ENV} to a ChromeDriver binary, or CHROME_BINARY to the Chrome executable."
+        )
+
+    path = _cached_binary(chrome_version)
+    if path:
+        return path, "cache"
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with FileLock(os.path.join(CACHE_DIR, ".lock")):
+        # Another worker may have filled the cache while we waited for the lock
+        path = _cached_binary(chrome_version)
+        if path:
+            return path, "cache"
+        return _store_binary(chrome_version, ChromeDriverManager().install()), "download"
+
+
+def resolve_driver_path():
+    """
+    Return the path of a ChromeDriver binary matching the installed Chrome.
+
+    Resolution order:
+    - CHROMEDRIVER_PATH environment variable (pinned local binary).
+    - On-disk cache keyed by the installed Chrome version (no network access);
+      when the version cannot be detected a RuntimeError asks for
+      CHROMEDRIVER_PATH or CHROME_BINARY.
+    - One-time download through webdriver_manager, guarded by a file lock
+      so concurrent workers download only once and share the result.
+    """
+    started = time.perf_counter()
+    path, source = _resolve()
+    seconds = time.perf_counter() - started
+
+    last_resolution.clear()
+    last_resolution.update({"path": path, "source": source, "seconds": seconds})
+    print(f"ChromeDriver resolved from {source} in {seconds:.3f}s: {path}")
+    return path
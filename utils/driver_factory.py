@@ -1,24 +1,56 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from utils.driver_binary import resolve_driver_path
+from utils.launch_profiles import get_launch_profile, release_profile_dir_on_quit
+from utils.readiness import install_readiness_hooks
+from utils.request_blocking import apply_blocking, get_profile
 
-def get_driver():
+def get_driver(performance_log=False, blocking_profile=None, launch_profile=None):
     """
     Initialize and return a Selenium Chrome WebDriver instance.
 
+    Args:
+    - performance_log: enable Chrome's performance log (DevTools network events),
+      needed by consumers of utils.devtools.PerformanceLog such as the site recorder.
+    - blocking_profile: name of a utils.request_blocking profile (or a BlockingProfile)
+      whose URL patterns and resource types are blocked through DevTools.
+    - launch_profile: name of a utils.launch_profiles profile (or a LaunchProfile);
+      "default" starts a visible, maximized browser.
+
     Features:
-    - Uses webdriver_manager to automatically manage ChromeDriver installation.
-    - Starts Chrome in maximized window mode.
+    - Resolves ChromeDriver from a pinned path or local cache, downloading it only once.
+    - Applies the launch profile (headless mode, window size, page-load strategy, ...).
+    - Installs the readiness hooks (pending requests, DOM mutations) on every page.
     - Returns the driver object ready to use in tests.
     """
     # Configure Chrome options
     options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")  # Start browser maximized for better visibility
+    launch = get_launch_profile(launch_profile)
+    launch.apply(options)
+    profile_lock = launch.claim_profile_dir(options)
+
+    profile = get_profile(blocking_profile)
+    for argument in profile.launch_arguments():
+        options.add_argument(argument)
+    # The console log is kept for failure artifacts
+    logging_prefs = {"browser": "ALL"}
+    if performance_log or profile.needs_monitoring():
+        # Blocked and loaded requests are counted from the DevTools network events
+        logging_prefs["performance"] = "ALL"
+    options.set_capability("goog:loggingPrefs", logging_prefs)
 
-    # Automatically download and configure ChromeDriver using webdriver_manager
-    service = Service(ChromeDriverManager().install())
+    # Pinned path, then Chrome-version keyed cache, then a one-time download
+    service = Service(resolve_driver_path())
 
     # Initialize Chrome WebDriver with the service and options
-    driver = webdriver.Chrome(service=service, options=options)
+    try:
+        driver = webdriver.Chrome(service=service, options=options)
+    except Exception:
+        if profile_lock is not None:
+            profile_lock.close()
+        raise
+    release_profile_dir_on_quit(driver, profile_lock)
+    install_readiness_hooks(driver)
+    apply_blocking(driver, profile)
 
     return driver
@@ -0,0 +1,215 @@
+import queue
+import threading
+import time
+
+from utils.driver_factory import get_driver
+
+
+class DriverPool:
+    """
+    Keep a number of warm Chrome sessions ready to be handed out to tests.
+
+    Features:
+    - Starts browsers in background threads so a test never pays for a cold start
+      unless the pool is exhausted.
+    - Resets a released browser (extra windows, cookies, storage, current URL)
+      in the background and puts it back into the pool.
+    - Health-checks every browser before handing it out and replaces broken
+      sessions or sessions that reached `max_uses`.
+    """
+
+    BLANK_URL = "about:blank"
+    # sessionStorage is not a CDP storage type; reset() clears it in each window
+    STORAGE_TYPES = "local_storage,indexeddb,websql,cache_storage,service_workers"
+    # Clears the window's sessionStorage (it survives navigating the tab away) and returns its origin
+    CLEAR_SESSION_JS = "try { window.sessionStorage.clear(); } catch (error) {} return window.location.origin;"
+
+    def __init__(self, size=1, max_uses=50, factory=get_driver):
+        self.size = size
+        self.max_uses = max_uses
+        self.factory = factory
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._workers = []
+
+        for _ in range(size):
+            self._spawn()
+
+    # -------------------
+    # Lifecycle
+    # -------------------
+
+    def _run_in_background(self, target, *args):
+        worker = threading.Thread(target=target, args=args, daemon=True)
+        with self._lock:
+            self._workers = [w for w in self._workers if w.is_alive()]
+            self._workers.append(worker)
+        worker.start()
+
+    def _spawn(self):
+        """Start one browser in a background thread and add it to the idle queue"""
+        self._run_in_background(self._start_driver)
+
+    def _start_driver(self):
+        try:
+            driver = self.factory()
+        except Exception as error:
+            # Hand the error to the next acquire() instead of losing it in a thread
+            self._idle.put(error)
+            return
+
+        with self._lock:
+            if self._closed:
+                driver.quit()
+                return
+            self._uses[driver.session_id] = 0
+        self._idle.put(driver)
+
+    def _discard(self, driver):
+        """Quit a browser and forget about it"""
+        with self._lock:
+            self._uses.pop(driver.session_id, None)
+        try:
+            driver.quit()
+        except Exception:
+            # A crashed chromedriver fails the quit command and possibly the service stop
+            pass
+
+    def close(self, timeout=30):
+        """
+        Quit every idle browser; browsers still in use are quit on release.
+        Waits up to `timeout` seconds for browsers starting or resetting in the
+        background; a hung one is left to its daemon thread, which quits it if it
+        ever finishes.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        for worker in workers:
+            worker.join(timeout=max(0, deadline - time.monotonic()))
+            if worker.is_alive():
+                print(f"Browser pool: gave up waiting for background thread {worker.name}")
+        while True:
+            try:
+                item = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(item, Exception):
+                self._discard(item)
+
+    # -------------------
+    # Lease Methods
+    # -------------------
+
+    def acquire(self, timeout=120):
+        """Return a healthy browser from the pool, waiting for one to warm up if needed"""
+        while True:
+            try:
+                item = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(
+                    f"No browser became available within {timeout}s (pool size {self.size}); "
+                    "every pooled browser is still leased or failed to start"
+                ) from None
+
+            if isinstance(item, Exception):
+                # Keep the pool at its configured size for the following tests
+                self._spawn()
+                raise item
+
+            if self.is_healthy(item):
+                return item
+
+            print(f"Recycling broken browser session {item.session_id}")
+            self._discard(item)
+            self._spawn()
+
+    def release(self, driver):
+        """Give a browser back; it is reset in the background before reuse"""
+        with self._lock:
+            closed = self._closed
+            uses = self._uses.get(driver.session_id, 0) + 1
+            self._uses[driver.session_id] = uses
+
+        if closed:
+            self._discard(driver)
+            return
+
+        if uses >= self.max_uses:
+            self._discard(driver)
+            self._spawn()
+            return
+
+        self._run_in_background(self._reset_and_return, driver)
+
+    def recycle(self, driver):
+        """Drop a leased browser and start a fresh one in its place"""
+        self._discard(driver)
+        if not self._closed:
+            self._spawn()
+
+    def _reset_and_return(self, driver):
+        try:
+            self.reset(driver)
+        except Exception as error:
+            # Any failure (a crashed chromedriver raises urllib3 errors) means the session is broken
+            print(f"Recycling browser session {driver.session_id} after a failed reset: {error!r}")
+            self.recycle(driver)
+            return
+
+        with self._lock:
+            closed = self._closed
+        if closed:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    # -------------------
+    # Browser State Methods
+    # -------------------
+
+    @staticmethod
+    def is_healthy(driver):
+        """Check that the browser session still answers commands"""
+        try:
+            driver.execute_script("return 1;")
+            return len(driver.window_handles) > 0
+        except Exception:
+            # WebDriverException, or urllib3's MaxRetryError when chromedriver itself is gone
+            return False
+
+    def reset(self, driver):
+        """
+        Bring a used browser back to a clean state:
+        clear sessionStorage in every window, close extra windows (e.g. the Lever
+        tab), clear cookies and storage for every open origin and navigate to a
+        blank page.
+        """
+        handles = driver.window_handles
+        origins = set()
+
+        for handle in reversed(handles):
+            driver.switch_to.window(handle)
+            origin = driver.execute_script(self.CLEAR_SESSION_JS)
+            if origin and origin != "null":
+                origins.add(origin)
+            if handle != handles[0]:
+                driver.close()
+
+        driver.switch_to.window(handles[0])
+
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in origins:
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin",
+                    {"origin": origin, "storageTypes": self.STORAGE_TYPES},
+                )
+        else:
+            driver.delete_all_cookies()
+            driver.execute_script("window.localStorage.clear();")
+
+        driver.get(self.BLANK_URL)
@@ -0,0 +1,139 @@
+"""
+Element cache for the page objects.
+
+Elements are cached per driver, keyed by locator (and by tab when journeys run in
+concurrent tabs), and scoped to the current document: commands that load or leave
+a document (get, back, forward, refresh, window and frame switches) clear the
+cache of the tab that sent them.
+
+DOM mutations are not tracked command by command: checking the page's mutation
+count before every cache hit would cost the same round trip as a new lookup.
+Instead page objects clear the cache where they wait for a detected re-render
+(e.g. the job list after a filter), and any other re-render shows up as a stale
+element reference.
+
+Cached elements are CachedElement instances. When a command on one fails with a
+stale element reference (the list re-rendered, a click navigated away) the
+element is looked up again by its locator and the command is retried once, so a
+page object can keep using the element it found earlier.
+"""
+import threading
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+from utils.command_hooks import add_command_hook
+from utils.tab_executor import current_tab
+
+# Commands after which the elements found before belong to another document
+DOCUMENT_CHANGING_COMMANDS = {
+    Command.GET,
+    Command.GO_BACK,
+    Command.GO_FORWARD,
+    Command.REFRESH,
+    Command.SWITCH_TO_WINDOW,
+    Command.CLOSE,
+    Command.SWITCH_TO_FRAME,
+    Command.SWITCH_TO_PARENT_FRAME,
+}
+
+
+class CachedElement(WebElement):
+    """A WebElement that finds itself again by locator when its reference went stale"""
+
+    def __init__(self, parent, id_, locator, index=0):
+        super().__init__(parent, id_)
+        self.locator = locator
+        self.index = index
+
+    @classmethod
+    def wrap(cls, element, locator, index=0):
+        return cls(element.parent, element.id, locator, index)
+
+    def _refresh(self):
+        """Point this element at the current match of its locator; False if there is none"""
+        matches = self._parent.find_elements(*self.locator)
+        if len(matches) <= self.index:
+            return False
+        self._id = matches[self.index].id
+        return True
+
+    def _retry_stale(self, action):
+        try:
+            return action()
+        except StaleElementReferenceException:
+            if not self._refresh():
+                raise
+            return action()
+
+    def _execute(self, command, params=None):
+        return self._retry_stale(lambda: super(CachedElement, self)._execute(command, dict(params or {})))
+
+    # These go through driver.execute_script instead of _execute
+    def is_displayed(self):
+        return self._retry_stale(super().is_displayed)
+
+    def get_attribute(self, name):
+        return self._retry_stale(lambda: super(CachedElement, self).get_attribute(name))
+
+
+class ElementCache:
+    """Locator -> element cache of one driver"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._elements = {}
+        self._lock = threading.Lock()
+        add_command_hook(driver, self._invalidate_on_navigation)
+
+    @classmethod
+    def for_driver(cls, driver):
+        cache = driver.__dict__.get("_element_cache")
+        if cache is None:
+            cache = driver._element_cache = cls(driver)
+        return cache
+
+    @classmethod
+    def forget_tab(cls, driver, tab):
+        """Drop the elements a closed tab cached on `driver`"""
+        cache = driver.__dict__.get("_element_cache")
+        if cache is None:
+            return
+        with cache._lock:
+            for key in [key for key in cache._elements if key[0] is tab]:
+                del cache._elements[key]
+
+    def _key(self, locator, many):
+        # The Tab itself, not its id(): a later tab could get the id of a closed one
+        return (current_tab(), tuple(locator), many)
+
+    def get(self, locator, many=False):
+        return self._elements.get(self._key(locator, many))
+
+    def put(self, locator, found, many=False):
+        """Cache a found element (or list of elements) and return it wrapped as CachedElement"""
+        if many:
+            cached = [CachedElement.wrap(element, locator, index) for index, element in enumerate(found)]
+        else:
+            cached = CachedElement.wrap(found, locator)
+        with self._lock:
+            self._elements[self._key(locator, many)] = cached
+        return cached
+
+    def invalidate(self, locator=None):
+        """Forget the calling tab's elements, all of them or those of one locator"""
+        with self._lock:
+            if locator is None:
+                tab = current_tab()
+                for key in [key for key in self._elements if key[0] is tab]:
+                    del self._elements[key]
+            else:
+                for many in (False, True):
+                    self._elements.pop(self._key(locator, many), None)
+
+    def _invalidate_on_navigation(self, command, params, call):
+        response = call()
+        if command in DOCUMENT_CHANGING_COMMANDS:
+            self.invalidate()
+        return response
@@ -0,0 +1,55 @@
+"""
+Inter-process file lock, for files shared by parallel workers (the ChromeDriver
+cache, the resource sizes file).
+"""
+import sys
+import time
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """
+    Exclusive inter-process lock on a file, shared by all parallel workers.
+    Waits up to `timeout` seconds, e.g. while another worker downloads ChromeDriver.
+    """
+
+    POLL_SECONDS = 0.2
+
+    def __init__(self, path, timeout=300):
+        self.path = path
+        self.timeout = timeout
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a+")
+        deadline = time.monotonic() + self.timeout
+        while not self._try_lock():
+            if time.monotonic() > deadline:
+                self._file.close()
+                raise TimeoutError(f"Could not lock {self.path} within {self.timeout}s")
+            time.sleep(self.POLL_SECONDS)
+        return self
+
+    def _try_lock(self):
+        try:
+            if sys.platform == "win32":
+                # LK_LOCK gives up after 10 attempts, so poll the non-blocking variant instead
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
+    def __exit__(self, *exc_info):
+        if sys.platform == "win32":
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
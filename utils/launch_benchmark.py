@@ -0,0 +1,118 @@
+"""
+Startup benchmark for the launch profiles.
+
+For every profile it measures, over a few rounds:
+- cold start: get_driver() until the session is ready,
+- first navigation: driver.get() of the home page,
+- peak RSS of the whole browser process tree (Linux /proc only).
+
+Usage:
+    python -m utils.launch_benchmark --rounds 3 --profiles headless-fast low-memory --output launch_benchmark.json
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+
+from pages.home_page import HomePage
+from utils.driver_factory import get_driver
+from utils.launch_profiles import LAUNCH_PROFILES
+from utils.proc_stats import driver_usage
+
+
+class PeakRssSampler:
+    """Sample the browser tree RSS in the background and keep the peak"""
+
+    def __init__(self, driver, interval=0.05):
+        self.driver = driver
+        self.interval = interval
+        self.peak_bytes = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            usage = driver_usage(self.driver)
+            if usage is not None:
+                self.peak_bytes = max(self.peak_bytes or 0, usage["rss_bytes"])
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def benchmark_profile(profile_name, url, rounds):
+    """Run one profile `rounds` times and return its per-round measurements"""
+    samples = []
+    for round_number in range(1, rounds + 1):
+        started = time.perf_counter()
+        driver = get_driver(launch_profile=profile_name)
+        cold_start = time.perf_counter() - started
+        try:
+            with PeakRssSampler(driver) as sampler:
+                started = time.perf_counter()
+                driver.get(url)
+                first_navigation = time.perf_counter() - started
+        finally:
+            driver.quit()
+
+        sample = {"cold_start_s": cold_start, "first_navigation_s": first_navigation, "peak_rss_bytes": sampler.peak_bytes}
+        print(f"{profile_name} round {round_number}: {format_sample(sample)}")
+        samples.append(sample)
+    return samples
+
+
+def summarize(samples):
+    """Median of every measurement over the rounds"""
+    summary = {}
+    for key in samples[0]:
+        values = [sample[key] for sample in samples if sample[key] is not None]
+        summary[key] = statistics.median(values) if values else None
+    return summary
+
+
+def format_sample(sample):
+    rss = sample["peak_rss_bytes"]
+    rss_text = f"{rss / 1_000_000:.0f} MB" if rss is not None else "n/a"
+    return (
+        f"cold start {sample['cold_start_s']:.2f}s, "
+        f"first navigation {sample['first_navigation_s']:.2f}s, "
+        f"peak RSS {rss_text}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Chrome launch profiles")
+    parser.add_argument("--profiles", nargs="+", default=list(LAUNCH_PROFILES), choices=list(LAUNCH_PROFILES))
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--url", default=HomePage.URL, help="Page loaded for the first navigation")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for profile_name in args.profiles:
+        samples = benchmark_profile(profile_name, args.url, args.rounds)
+        results[profile_name] = {"median": summarize(samples), "rounds": samples}
+
+    print("\nMedian per profile (fastest total first):")
+    ranking = sorted(
+        results.items(),
+        key=lambda result: result[1]["median"]["cold_start_s"] + result[1]["median"]["first_navigation_s"],
+    )
+    for profile_name, result in ranking:
+        print(f"  {profile_name:<14} {format_sample(result['median'])}")
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Named Chrome launch profiles.
+
+A profile bundles everything that decides how fast a browser starts and loads
+pages: headless mode, window size, page-load strategy, disabled background
+features and the profile (user data and cache) directory.
+"""
+import os
+import sys
+
+from selenium.webdriver.remote.command import Command
+
+from utils.command_hooks import add_command_hook
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+PROFILE_ROOT = os.environ.get(
+    "CHROME_PROFILE_ROOT",
+    os.path.join(os.path.expanduser("~"), ".cache", "qa-chrome-profiles"),
+)
+
+# Background work Chrome does on its own that a test run never needs
+BACKGROUND_FEATURE_ARGUMENTS = [
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-domain-reliability",
+    "--disable-client-side-phishing-detection",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,AutofillServerCommunication",
+]
+
+# Keep background tabs running at full speed, for journeys running in concurrent tabs
+BACKGROUND_TAB_ARGUMENTS = [
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+]
+
+LOW_MEMORY_ARGUMENTS = [
+    "--renderer-process-limit=2",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--js-flags=--max-old-space-size=512",
+]
+
+
+class LaunchProfile:
+    """Chrome startup settings applied to ChromeOptions by get_driver"""
+
+    def __init__(
+        self,
+        name,
+        headless=False,
+        window_size=None,
+        maximized=False,
+        page_load_strategy="normal",
+        disable_background_features=False,
+        arguments=(),
+        persistent_profile=False,
+        disk_cache_size=None,
+    ):
+        self.name = name
+        self.headless = headless
+        self.window_size = window_size
+        self.maximized = maximized
+        # "normal" waits for the load event, "eager" for DOMContentLoaded, "none" returns at once
+        self.page_load_strategy = page_load_strategy
+        self.disable_background_features = disable_background_features
+        self.arguments = list(arguments)
+        # Reuse a warm user data dir (HTTP cache included) from PROFILE_ROOT between runs
+        self.persistent_profile = persistent_profile
+        self.disk_cache_size = disk_cache_size
+
+    def apply(self, options):
+        """Write the profile into ChromeOptions"""
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.maximized:
+            options.add_argument("--start-maximized")
+        if self.window_size:
+            options.add_argument("--window-size={},{}".format(*self.window_size))
+        if self.disable_background_features:
+            for argument in BACKGROUND_FEATURE_ARGUMENTS:
+                options.add_argument(argument)
+        if self.disk_cache_size:
+            options.add_argument(f"--disk-cache-size={self.disk_cache_size}")
+        for argument in self.arguments:
+            options.add_argument(argument)
+        options.page_load_strategy = self.page_load_strategy
+
+    def claim_profile_dir(self, options):
+        """
+        Lock a free profile slot under PROFILE_ROOT and point Chrome at it.
+
+        Chrome refuses to share a user data dir between running browsers, so each
+        pooled or parallel browser takes its own slot; the slots (and their HTTP
+        caches) stay warm across runs. Returns the lock to release on quit.
+        """
+        if not self.persistent_profile:
+            return None
+
+        root = os.path.join(PROFILE_ROOT, self.name)
+        os.makedirs(root, exist_ok=True)
+        slot = 0
+        while True:
+            lock_file = open(os.path.join(root, f"slot-{slot}.lock"), "a+")
+            try:
+                if sys.platform == "win32":
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                slot += 1
+                continue
+            options.add_argument(f"--user-data-dir={os.path.join(root, f'slot-{slot}')}")
+            return lock_file
+
+
+def release_profile_dir_on_quit(driver, lock_file):
+    """Give the profile slot back once the browser has quit"""
+    if lock_file is None:
+        return
+
+    def release(command, params, call):
+        response = call()
+        if command == Command.QUIT:
+            lock_file.close()
+        return response
+
+    add_command_hook(driver, release)
+
+
+LAUNCH_PROFILES = {
+    # What get_driver always did: a visible, maximized browser with the default load strategy
+    "default": LaunchProfile("default", maximized=True),
+    "headed-debug": LaunchProfile("headed-debug", maximized=True, arguments=["--auto-open-devtools-for-tabs"]),
+    "headless-fast": LaunchProfile(
+        "headless-fast",
+        headless=True,
+        window_size=(1920, 1080),
+        page_load_strategy="eager",
+        disable_background_features=True,
+        persistent_profile=True,
+    ),
+    "multi-tab": LaunchProfile(
+        "multi-tab",
+        headless=True,
+        window_size=(1920, 1080),
+        page_load_strategy="eager",
+        disable_background_features=True,
+        arguments=BACKGROUND_TAB_ARGUMENTS,
+    ),
+    "low-memory": LaunchProfile(
+        "low-memory",
+        headless=True,
+        window_size=(1366, 768),
+        page_load_strategy="eager",
+        disable_background_features=True,
+        arguments=LOW_MEMORY_ARGUMENTS,
+        disk_cache_size=50_000_000,
+    ),
+}
+
+
+def get_launch_profile(profile):
+    """Accept a profile name or a LaunchProfile instance"""
+    if profile is None:
+        return LAUNCH_PROFILES["default"]
+    if isinstance(profile, LaunchProfile):
+        return profile
+    if profile not in LAUNCH_PROFILES:
+        raise ValueError(f"Unknown launch profile '{profile}', choose from: {', '.join(LAUNCH_PROFILES)}")
+    return LAUNCH_PROFILES[profile]
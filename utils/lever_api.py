@@ -0,0 +1,72 @@
+"""
+Lever postings API, the data behind the careers job list.
+
+The QA job list on useinsider.com is rendered from the public Lever postings of
+the company, so the whole list can be validated from one HTTP request instead of
+reading every card in the browser. Requests go through a shared connection pool
+with retries; offline runs read the postings saved next to the site captures.
+"""
+import json
+import os
+
+import urllib3
+
+COMPANY = "useinsider"
+POSTINGS_URL = "https://api.lever.co/v0/postings/{company}?mode=json"
+# Saved in the capture dir by --site record and read back by --site replay
+POSTINGS_FILE = "lever_postings.json"
+
+_http = urllib3.PoolManager(
+    num_pools=2,
+    maxsize=4,
+    retries=urllib3.Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+    timeout=urllib3.Timeout(connect=5, read=20),
+)
+
+
+def fetch_postings(company=COMPANY):
+    """Download every published posting of `company`"""
+    url = POSTINGS_URL.format(company=company)
+    response = _http.request("GET", url, headers={"Accept": "application/json"})
+    if response.status != 200:
+        raise RuntimeError(f"Lever postings request failed: HTTP {response.status} for {url}")
+    return json.loads(response.data)
+
+
+def save_postings(postings, capture_dir):
+    os.makedirs(capture_dir, exist_ok=True)
+    path = os.path.join(capture_dir, POSTINGS_FILE)
+    with open(path, "w") as postings_file:
+        json.dump(postings, postings_file)
+    return path
+
+
+def load_postings(capture_dir):
+    path = os.path.join(capture_dir, POSTINGS_FILE)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No Lever postings in {capture_dir}, run once with --site record")
+    with open(path) as postings_file:
+        return json.load(postings_file)
+
+
+def posting_record(posting):
+    """Turn a posting into the record shape of QAJobsPage.get_job_records()"""
+    categories = posting.get("categories", {})
+    return {
+        "id": posting["id"],
+        "position": posting.get("text", ""),
+        # The careers page shows the Lever team as the department
+        "department": categories.get("team") or categories.get("department", ""),
+        "location": categories.get("location", ""),
+        "href": posting.get("hostedUrl", ""),
+    }
+
+
+def filter_records(records, department, location):
+    """Keep the records the careers page shows for a department and location filter"""
+    return [record for record in records if department in record["department"] and location in record["location"]]
+
+
+def posting_id(href):
+    """Posting id at the end of a jobs.lever.co link (also when rewritten to the replay server)"""
+    return href.split("?")[0].rstrip("/").rsplit("/", 1)[-1]
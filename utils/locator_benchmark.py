@@ -0,0 +1,112 @@
+"""
+Locator lookup micro-benchmark.
+
+Times every locator of a page object and, where the selector can be expressed
+both ways, its XPath and CSS forms side by side:
+- round trip: driver.find_elements(), what a page-object lookup really costs,
+- in page: the bare selector engine (querySelectorAll vs document.evaluate),
+  repeated inside one script so WebDriver overhead does not hide the difference.
+
+Text-matching XPath locators (//h3[text()='...']) have no CSS form and are timed as XPath only.
+"""
+import re
+import statistics
+import time
+
+from selenium.webdriver.common.by import By
+
+# Returns the average time of one lookup in microseconds and the number of matches
+IN_PAGE_LOOKUP_JS = """
+const [strategy, selector, repeats] = arguments;
+const lookup = strategy === 'css'
+    ? () => document.querySelectorAll(selector).length
+    : () => document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+let matches = 0;
+const started = performance.now();
+for (let i = 0; i < repeats; i++) matches = lookup();
+return {microseconds: (performance.now() - started) * 1000 / repeats, matches: matches};
+"""
+
+# tag, #id and .class compounds separated by descendant spaces, e.g. "div.job-list a.btn.btn-navy"
+SIMPLE_CSS = re.compile(r"^[a-z0-9]*(?:[.#][\w-]+)*$")
+
+
+def css_to_xpath(css):
+    """Translate a simple CSS selector to XPath, or return None when it is not simple"""
+    steps = []
+    for compound in css.split():
+        if not SIMPLE_CSS.match(compound):
+            return None
+        tag = re.match(r"^[a-z0-9]*", compound).group() or "*"
+        predicates = []
+        for kind, name in re.findall(r"([.#])([\w-]+)", compound):
+            if kind == "#":
+                predicates.append(f"@id='{name}'")
+            else:
+                predicates.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')")
+        steps.append(tag + "".join(f"[{predicate}]" for predicate in predicates))
+    return "//" + "//".join(steps) if steps else None
+
+
+def locator_forms(locator):
+    """Return {"css": selector, "xpath": selector} for the forms a locator can be written in"""
+    by, selector = locator
+    if by == By.CSS_SELECTOR:
+        forms = {"css": selector}
+        xpath = css_to_xpath(selector)
+        if xpath:
+            forms["xpath"] = xpath
+        return forms
+    if by == By.ID:
+        return {"css": f"#{selector}", "xpath": f"//*[@id='{selector}']"}
+    if by == By.XPATH:
+        return {"xpath": selector}
+    return {}
+
+
+def page_locators(page):
+    """Return {"QAJobsPage.JOB_CARDS": (By..., "..."), ...} for the locators of a page object"""
+    locators = {}
+    for name, value in vars(page).items():
+        if name.isupper() and isinstance(value, tuple) and len(value) == 2:
+            locators[f"{type(page).__name__}.{name}"] = value
+    return locators
+
+
+def benchmark_locator(driver, strategy, selector, repeats=20, in_page_repeats=200):
+    """Time one selector form; returns its row for the report"""
+    by = By.CSS_SELECTOR if strategy == "css" else By.XPATH
+    round_trips = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        driver.find_elements(by, selector)
+        round_trips.append((time.perf_counter() - started) * 1000)
+    in_page = driver.execute_script(IN_PAGE_LOOKUP_JS, strategy, selector, in_page_repeats)
+    return {
+        "strategy": strategy,
+        "selector": selector,
+        "matches": in_page["matches"],
+        "round_trip_ms": statistics.median(round_trips),
+        "in_page_us": in_page["microseconds"],
+    }
+
+
+def benchmark_page(driver, page, repeats=20):
+    """Time every locator of a page object on the page the browser is showing"""
+    rows = []
+    for name, locator in page_locators(page).items():
+        for strategy, selector in locator_forms(locator).items():
+            row = benchmark_locator(driver, strategy, selector, repeats)
+            row["locator"] = name
+            rows.append(row)
+    return rows
+
+
+def format_rows(rows):
+    lines = []
+    for row in rows:
+        lines.append(
+            f"  {row['locator']:<36} {row['strategy']:<5} matches {row['matches']:<3} "
+            f"round trip {row['round_trip_ms']:.2f} ms  in page {row['in_page_us']:.1f} us"
+        )
+    return "\n".join(lines)
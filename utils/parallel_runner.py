@@ -0,0 +1,333 @@
+"""
+Pytest plugin that spreads the collected tests over several worker processes.
+
+Each worker is a regular pytest process running one shard of the tests with its
+own browser. Shards are balanced with historical durations (longest tests first)
+and the workers' reports are replayed in the main process, so terminal output,
+junitxml and the exit code look exactly like a serial run.
+
+-x/--maxfail count the failures of all workers: once reached, the remaining
+workers are stopped like on Ctrl-C or a controller error (interrupted first, so
+they quit their browsers, then killed if they do not exit).
+"""
+import argparse
+import glob
+import heapq
+import json
+import os
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+from _pytest.reports import TestReport
+
+DEFAULT_DURATIONS_FILE = ".test_durations.json"
+# Set in every worker process to its index, so per-run outputs can be written per worker and merged
+WORKER_ID_ENV = "PYTEST_WORKER_ID"
+DEFAULT_DURATION = 1.0
+# Seconds a stopped worker gets to quit its browsers before it is killed
+WORKER_STOP_TIMEOUT = 15
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("parallel")
+    group.addoption(
+        "--workers",
+        default=os.environ.get("PYTEST_WORKERS", "1"),
+        help="Number of worker processes, or 'auto' for one per CPU core (default: 1)",
+    )
+    group.addoption(
+        "--durations-file",
+        default=DEFAULT_DURATIONS_FILE,
+        help="File holding historical test durations used to balance shards",
+    )
+    # Internal options passed by the controller to its workers
+    group.addoption("--worker-shard", help=argparse.SUPPRESS)
+    group.addoption("--worker-report", help=argparse.SUPPRESS)
+
+
+# -------------------
+# Sharding Helpers
+# -------------------
+
+def worker_count(config):
+    """Return the requested number of workers as an int"""
+    value = str(config.getoption("--workers"))
+    if value == "auto":
+        return os.cpu_count() or 1
+    return max(1, int(value))
+
+
+def is_worker(config):
+    return config.getoption("--worker-report") is not None
+
+
+def worker_id():
+    """Index of this worker process, or None outside parallel workers"""
+    return os.environ.get(WORKER_ID_ENV)
+
+
+def write_worker_data(path, data):
+    """Write the JSON `data` of this worker for the controller to merge"""
+    with open(path, "w") as data_file:
+        json.dump(data, data_file)
+
+
+def merge_worker_data(pattern):
+    """Return the data written by the workers to files matching `pattern` and remove the files"""
+    merged = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path) as data_file:
+            merged.append(json.load(data_file))
+        os.remove(path)
+    return merged
+
+
+def gather_worker_data(path, data):
+    """
+    Bring per-run report data (e.g. samples) to the process writing the report at
+    `path`. A worker writes its `data` next to `path` and gets None; the controller
+    or a serial run gets the list of the workers' data to add to its own.
+    """
+    if worker_id() is not None:
+        write_worker_data(f"{path}.worker-{worker_id()}", data)
+        return None
+    return merge_worker_data(f"{path}.worker-*")
+
+
+def is_controller(config):
+    """True when this process only dispatches tests and never runs them itself"""
+    return not is_worker(config) and worker_count(config) > 1 and not config.option.collectonly
+
+
+def load_durations(path):
+    try:
+        with open(path) as durations_file:
+            return json.load(durations_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(path, durations):
+    with open(path + ".tmp", "w") as durations_file:
+        json.dump(durations, durations_file, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def balance_shards(nodeids, durations, shard_count):
+    """
+    Split nodeids into shards with similar total duration.
+
+    Longest-processing-time-first: tests are taken from slowest to fastest and each
+    one goes to the shard with the smallest total so far. Tests without history
+    are assumed to take the median known duration.
+    """
+    known = [durations[nodeid] for nodeid in nodeids if nodeid in durations]
+    default = statistics.median(known) if known else DEFAULT_DURATION
+    ordered = sorted(nodeids, key=lambda nodeid: durations.get(nodeid, default), reverse=True)
+
+    shards = [[] for _ in range(shard_count)]
+    heap = [(0.0, index) for index in range(shard_count)]
+    for nodeid in ordered:
+        total, index = heapq.heappop(heap)
+        shards[index].append(nodeid)
+        heapq.heappush(heap, (total + durations.get(nodeid, default), index))
+    return [shard for shard in shards if shard]
+
+
+# -------------------
+# Worker Side
+# -------------------
+
+def pytest_collection_modifyitems(config, items):
+    """In a worker, keep only the tests of our shard, in shard order"""
+    shard_file = config.getoption("--worker-shard")
+    if not shard_file:
+        return
+
+    with open(shard_file) as shard:
+        order = {nodeid: index for index, nodeid in enumerate(json.load(shard))}
+    selected = sorted((item for item in items if item.nodeid in order), key=lambda item: order[item.nodeid])
+    deselected = [item for item in items if item.nodeid not in order]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+class DurationRecorder:
+    """Collect per-test durations and remember them for the next sharding"""
+
+    def __init__(self, config):
+        self.config = config
+        self.durations = {}
+        self._report_file = None
+        if is_worker(config):
+            self._report_file = open(config.getoption("--worker-report"), "a", buffering=1)
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+        if self._report_file is not None:
+            data = self.config.hook.pytest_report_to_serializable(config=self.config, report=report)
+            self._report_file.write(json.dumps(data) + "\n")
+
+    def pytest_sessionfinish(self, session):
+        if self._report_file is not None:
+            self._report_file.close()
+            return
+        if not self.durations:
+            return
+        path = self.config.getoption("--durations-file")
+        history = load_durations(path)
+        history.update(self.durations)
+        save_durations(path, history)
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(DurationRecorder(config), "duration-recorder")
+
+
+# -------------------
+# Controller Side
+# -------------------
+
+class _Worker:
+    def __init__(self, index, shard, workdir, command, cwd):
+        self.index = index
+        self.shard = shard
+        self.report_path = os.path.join(workdir, f"worker-{index}.jsonl")
+        self.log_path = os.path.join(workdir, f"worker-{index}.log")
+        shard_path = os.path.join(workdir, f"shard-{index}.json")
+        with open(shard_path, "w") as shard_file:
+            json.dump(shard, shard_file)
+        open(self.report_path, "w").close()
+
+        self._log = open(self.log_path, "w")
+        self.process = subprocess.Popen(
+            command + ["--worker-shard", shard_path, "--worker-report", self.report_path],
+            cwd=cwd,
+            env={**os.environ, WORKER_ID_ENV: str(index)},
+            stdout=self._log,
+            stderr=subprocess.STDOUT,
+        )
+        self._reports = open(self.report_path)
+        self._pending = ""
+
+    def read_reports(self):
+        """Return the complete report lines written since the last call"""
+        self._pending += self._reports.read()
+        *lines, self._pending = self._pending.split("\n")
+        return [json.loads(line) for line in lines if line]
+
+    def stop(self):
+        """Interrupt a running worker so it tears its browsers down, kill it if it does not exit"""
+        if self.process.poll() is not None:
+            return
+        if sys.platform == "win32":
+            self.process.terminate()
+        else:
+            self.process.send_signal(signal.SIGINT)
+        try:
+            self.process.wait(timeout=WORKER_STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+    def close(self):
+        self._reports.close()
+        self._log.close()
+
+
+def _worker_command(config):
+    command = [sys.executable, "-m", "pytest", *config.invocation_params.args, "--workers", "1", "-p", "no:cacheprovider"]
+    # Worker option values are paths too, pin the rootdir so nodeids stay identical
+    command += ["--rootdir", str(config.rootpath)]
+    if getattr(config.option, "xmlpath", None):
+        # Only the controller writes the merged junit report
+        command += ["--junitxml", os.devnull]
+    return command
+
+
+def _replay(config, data, started):
+    report = config.hook.pytest_report_from_serializable(config=config, data=data)
+    if report.nodeid not in started:
+        started.add(report.nodeid)
+        config.hook.pytest_runtest_logstart(nodeid=report.nodeid, location=report.location)
+    config.hook.pytest_runtest_logreport(report=report)
+    if report.when == "teardown":
+        config.hook.pytest_runtest_logfinish(nodeid=report.nodeid, location=report.location)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    config = session.config
+    if not is_controller(config) or session.testsfailed or not session.items:
+        return None
+
+    items = {item.nodeid: item for item in session.items}
+    durations = load_durations(config.getoption("--durations-file"))
+    shards = balance_shards(list(items), durations, min(worker_count(config), len(items)))
+
+    terminal = config.pluginmanager.get_plugin("terminalreporter")
+    if terminal is not None:
+        terminal.write_line(f"running {len(items)} tests in {len(shards)} worker processes")
+
+    workdir = tempfile.mkdtemp(prefix="pytest-workers-")
+    command = _worker_command(config)
+    workers = []
+    started = set()
+    finished = set()
+    try:
+        for index, shard in enumerate(shards):
+            workers.append(_Worker(index, shard, workdir, command, str(config.invocation_params.dir)))
+
+        running = list(workers)
+        while running and not (session.shouldfail or session.shouldstop):
+            for worker in list(running):
+                exited = worker.process.poll() is not None
+                for data in worker.read_reports():
+                    # Replaying a failure counts it towards -x/--maxfail (session.shouldfail)
+                    _replay(config, data, started)
+                    if data.get("when") == "teardown":
+                        finished.add(data["nodeid"])
+                if exited:
+                    running.remove(worker)
+            if running:
+                time.sleep(0.1)
+    finally:
+        # Ctrl-C, a controller error or --maxfail: no worker may outlive us with its browser
+        for worker in workers:
+            worker.stop()
+            worker.close()
+
+    if session.shouldfail or session.shouldstop:
+        shutil.rmtree(workdir, ignore_errors=True)
+        if session.shouldfail:
+            raise session.Failed(session.shouldfail)
+        raise session.Interrupted(session.shouldstop)
+
+    crashed = False
+    for worker in workers:
+        for nodeid in worker.shard:
+            if nodeid in finished:
+                continue
+            crashed = True
+            item = items[nodeid]
+            report = TestReport(
+                nodeid,
+                item.location,
+                {},
+                "failed",
+                f"worker {worker.index} exited with code {worker.process.returncode} "
+                f"before finishing this test, see {worker.log_path}",
+                "call",
+            )
+            _replay(config, config.hook.pytest_report_to_serializable(config=config, report=report), started)
+
+    if not crashed:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return True
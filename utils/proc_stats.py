@@ -0,0 +1,72 @@
+"""
+Resource usage of a browser process tree, read from /proc (Linux only).
+
+Chrome runs as many processes (browser, GPU, renderers, utilities) under the
+chromedriver service process, so the figures are summed over the whole tree.
+On systems without /proc the functions return None.
+"""
+import os
+
+PROC = "/proc"
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def is_supported():
+    return os.path.isdir(os.path.join(PROC, "self"))
+
+
+def _read_stat(pid):
+    """Return the fields of /proc/<pid>/stat after the command name"""
+    with open(os.path.join(PROC, str(pid), "stat")) as stat_file:
+        # The command name may contain spaces, it ends at the last ')'
+        return stat_file.read().rsplit(")", 1)[1].split()
+
+
+def process_tree(root_pid):
+    """Return the pid of `root_pid` and all of its descendants"""
+    children = {}
+    for name in os.listdir(PROC):
+        if not name.isdigit():
+            continue
+        try:
+            parent = int(_read_stat(name)[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(name))
+
+    tree = [root_pid]
+    for pid in tree:
+        tree.extend(children.get(pid, []))
+    return tree
+
+
+def tree_usage(root_pid):
+    """
+    Return {'pids', 'rss_bytes', 'cpu_seconds'} for a process tree, or None when
+    /proc is not available or the root process is gone.
+    """
+    if not is_supported() or not os.path.exists(os.path.join(PROC, str(root_pid))):
+        return None
+
+    pids = process_tree(root_pid)
+    rss_bytes = 0
+    cpu_seconds = 0.0
+    for pid in pids:
+        try:
+            fields = _read_stat(pid)
+        except OSError:
+            continue  # process exited while we were reading
+        # utime and stime are fields 14 and 15, rss (pages) is field 24 of /proc/<pid>/stat
+        cpu_seconds += (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        rss_bytes += int(fields[21]) * PAGE_SIZE
+    return {"pids": len(pids), "rss_bytes": rss_bytes, "cpu_seconds": cpu_seconds}
+
+
+def driver_usage(driver):
+    """Resource usage of the browser started by a local chromedriver service"""
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    if process is None:
+        return None
+    return tree_usage(process.pid)
@@ -0,0 +1,165 @@
+"""
+Event-driven readiness conditions for WebDriverWait.
+
+Every condition follows the selenium expected_conditions style: it returns a
+callable that takes the driver and returns a truthy value once the page is ready,
+e.g. `WebDriverWait(driver, 10).until(network_idle())`.
+
+The conditions read state collected in the page by READINESS_HOOKS_JS:
+pending fetch/XHR requests and DOM mutations seen by a MutationObserver.
+
+Only childList mutations (nodes added or removed) count: carousels and other
+animations on the marketing pages keep changing attributes and text, which would
+never let a page look quiet. Waits on a list prefer list_quiet/list_rerendered,
+which only look at the list container.
+"""
+
+READINESS_HOOKS_JS = """
+if (!window.__qaReadiness) {
+    const state = window.__qaReadiness = {
+        pending: 0,
+        lastRequest: performance.now(),
+        lastMutation: performance.now(),
+        watched: {},
+    };
+    const requestStarted = () => { state.pending++; state.lastRequest = performance.now(); };
+    const requestEnded = () => { state.pending = Math.max(0, state.pending - 1); state.lastRequest = performance.now(); };
+
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function () {
+            requestStarted();
+            return originalFetch.apply(this, arguments).finally(requestEnded);
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        requestStarted();
+        this.addEventListener('loadend', requestEnded);
+        return originalSend.apply(this, arguments);
+    };
+
+    new MutationObserver(() => { state.lastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true});
+
+    state.watch = (selector) => {
+        let watched = state.watched[selector];
+        // Fall back to the whole body when the container is not rendered yet
+        const target = document.querySelector(selector) || document.body;
+        if (!watched && target) {
+            watched = state.watched[selector] = {mutations: 0, lastMutation: performance.now()};
+            new MutationObserver((records) => {
+                watched.mutations += records.length;
+                watched.lastMutation = performance.now();
+            }).observe(target, {childList: true, subtree: true});
+        }
+        return watched ? watched.mutations : -1;
+    };
+}
+"""
+
+_STATE_JS = READINESS_HOOKS_JS + """
+const state = window.__qaReadiness;
+return {
+    readyState: document.readyState,
+    pending: state.pending,
+    sinceRequest: performance.now() - state.lastRequest,
+    sinceMutation: performance.now() - state.lastMutation,
+};
+"""
+
+_WATCH_JS = READINESS_HOOKS_JS + """
+const state = window.__qaReadiness;
+const mutations = state.watch(arguments[0]);
+const watched = state.watched[arguments[0]];
+return {mutations: mutations, sinceMutation: watched ? performance.now() - watched.lastMutation : 0};
+"""
+
+SELECT2_OPEN_JS = """
+const options = document.querySelectorAll('.select2-container--open .select2-results__option');
+return options.length > 0 && !document.querySelector('.select2-results__option.loading-results');
+"""
+SELECT2_CLOSED_JS = "return !document.querySelector('.select2-container--open');"
+SELECT_OPTIONS_JS = "const select = document.querySelector(arguments[0]); return !!select && select.options.length > arguments[1];"
+
+
+def install_readiness_hooks(driver):
+    """
+    Register the readiness hooks for every document the browser loads, so requests
+    started before the first check are counted too. Conditions still inject the
+    hooks lazily when this was not called (or the browser has no CDP).
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": READINESS_HOOKS_JS})
+
+
+def network_idle(idle_ms=500):
+    """Document loaded and no fetch/XHR request in flight for `idle_ms`"""
+    def _predicate(driver):
+        state = driver.execute_script(_STATE_JS)
+        return state["readyState"] == "complete" and state["pending"] == 0 and state["sinceRequest"] >= idle_ms
+    return _predicate
+
+
+def dom_quiet(quiet_ms=300):
+    """No node added or removed anywhere in the document for `quiet_ms`"""
+    def _predicate(driver):
+        return driver.execute_script(_STATE_JS)["sinceMutation"] >= quiet_ms
+    return _predicate
+
+
+def page_settled(idle_ms=500, quiet_ms=300):
+    """Network idle and DOM quiet at the same time"""
+    def _predicate(driver):
+        state = driver.execute_script(_STATE_JS)
+        return (
+            state["readyState"] == "complete"
+            and state["pending"] == 0
+            and state["sinceRequest"] >= idle_ms
+            and state["sinceMutation"] >= quiet_ms
+        )
+    return _predicate
+
+
+def select2_open():
+    """A select2 dropdown is open and its options finished loading"""
+    def _predicate(driver):
+        return driver.execute_script(SELECT2_OPEN_JS)
+    return _predicate
+
+
+def select2_closed():
+    """No select2 dropdown is open"""
+    def _predicate(driver):
+        return driver.execute_script(SELECT2_CLOSED_JS)
+    return _predicate
+
+
+def select_has_options(css_selector, more_than=1):
+    """The underlying <select> has been populated (placeholder option excluded)"""
+    def _predicate(driver):
+        return driver.execute_script(SELECT_OPTIONS_JS, css_selector, more_than)
+    return _predicate
+
+
+def watch_list(driver, css_selector):
+    """Start watching a list container and return its current mutation count"""
+    return driver.execute_script(_WATCH_JS, css_selector)["mutations"]
+
+
+def list_quiet(css_selector, quiet_ms=300):
+    """No node added to or removed from the list container for `quiet_ms`"""
+    def _predicate(driver):
+        return driver.execute_script(_WATCH_JS, css_selector)["sinceMutation"] >= quiet_ms
+    return _predicate
+
+
+def list_rerendered(css_selector, since_mutations, quiet_ms=300):
+    """
+    The list container changed after `watch_list` returned `since_mutations`
+    and has been stable for `quiet_ms` (e.g. job list re-rendered after a filter).
+    """
+    def _predicate(driver):
+        state = driver.execute_script(_WATCH_JS, css_selector)
+        return state["mutations"] > since_mutations and state["sinceMutation"] >= quiet_ms
+    return _predicate
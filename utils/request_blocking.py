@@ -0,0 +1,227 @@
+"""
+Request blocking profiles and per-page resource budgets.
+
+A profile blocks URL patterns and resource types through the DevTools protocol
+(Network.setBlockedURLs) and can optionally allow only a list of hosts. A
+ResourceMonitor counts the requests and bytes that were loaded or saved and
+reports pages that went over the request or byte budget.
+"""
+import json
+import os
+
+from selenium.webdriver.remote.command import Command
+
+from utils.command_hooks import add_command_hook
+from utils.devtools import PerformanceLog
+from utils.file_lock import FileLock
+
+DEFAULT_SIZES_FILE = ".resource_sizes.json"
+
+# Network.setBlockedURLs only matches URLs, so resource types are blocked by their file extensions
+RESOURCE_TYPE_PATTERNS = {
+    "Image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.ico*"],
+    "Font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "Media": ["*.mp4*", "*.webm*", "*.mp3*", "*.ogg*"],
+}
+
+TRACKER_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*connect.facebook.net*",
+    "*facebook.com/tr*",
+    "*snap.licdn.com*",
+    "*px.ads.linkedin.com*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*hs-scripts.com*",
+    "*hs-analytics.net*",
+    "*hsforms.net*",
+    "*intercom.io*",
+    "*intercomcdn.com*",
+    "*driftt.com*",
+    "*drift.com*",
+    "*bat.bing.com*",
+    "*yandex.ru*",
+]
+
+
+class BlockingProfile:
+    """A named set of blocking rules and optional per-page budgets"""
+
+    def __init__(self, name, url_patterns=(), resource_types=(), allow_hosts=(), max_requests=None, max_bytes=None):
+        self.name = name
+        self.url_patterns = list(url_patterns)
+        self.resource_types = list(resource_types)
+        # When set, every host not listed here fails to resolve (allowlist mode)
+        self.allow_hosts = list(allow_hosts)
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+
+    def blocked_url_patterns(self):
+        patterns = list(self.url_patterns)
+        for resource_type in self.resource_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        return patterns
+
+    def launch_arguments(self):
+        """Chrome arguments needed at startup (allowlist mode is enforced by the host resolver)"""
+        if not self.allow_hosts:
+            return []
+        excluded = ", ".join(f"EXCLUDE {host}" for host in self.allow_hosts + ["localhost", "127.0.0.1"])
+        return [f"--host-resolver-rules=MAP * ~NOTFOUND, {excluded}"]
+
+    def is_active(self):
+        return bool(self.blocked_url_patterns() or self.allow_hosts)
+
+    def needs_monitoring(self):
+        """True when requests must be counted, for the savings report or for a budget"""
+        return self.is_active() or self.max_requests is not None or self.max_bytes is not None
+
+    def with_budget(self, max_requests=None, max_bytes=None):
+        """Return a copy of the profile with the given budgets overriding its own"""
+        return BlockingProfile(
+            self.name,
+            url_patterns=self.url_patterns,
+            resource_types=self.resource_types,
+            allow_hosts=self.allow_hosts,
+            max_requests=max_requests if max_requests is not None else self.max_requests,
+            max_bytes=max_bytes if max_bytes is not None else self.max_bytes,
+        )
+
+
+PROFILES = {
+    "none": BlockingProfile("none"),
+    # Analytics, trackers and chat widgets: nothing the assertions look at
+    "no-trackers": BlockingProfile("no-trackers", url_patterns=TRACKER_PATTERNS),
+    # Also drop fonts and media; images stay because the logo check needs them
+    "lean": BlockingProfile("lean", url_patterns=TRACKER_PATTERNS, resource_types=["Font", "Media"]),
+    # Only the sites under test and the CDNs they load their scripts from
+    "first-party": BlockingProfile(
+        "first-party",
+        resource_types=["Font", "Media"],
+        allow_hosts=["useinsider.com", "*.useinsider.com", "*.lever.co", "*.jsdelivr.net", "*.cloudflare.com", "*.jquery.com"],
+    ),
+}
+
+
+def get_profile(profile):
+    """Accept a profile name or a BlockingProfile instance"""
+    if profile is None:
+        return PROFILES["none"]
+    if isinstance(profile, BlockingProfile):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown blocking profile '{profile}', choose from: {', '.join(PROFILES)}")
+    return PROFILES[profile]
+
+
+def apply_blocking(driver, profile):
+    """Block the profile's URL patterns in the current window and in every window switched to later"""
+    patterns = profile.blocked_url_patterns()
+    if not patterns:
+        return
+
+    def block():
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+    def reapply_on_switch(command, params, call):
+        # Blocked URLs are set per tab, so new tabs (e.g. Lever) need them as well
+        response = call()
+        if command == Command.SWITCH_TO_WINDOW:
+            block()
+        return response
+
+    block()
+    add_command_hook(driver, reapply_on_switch)
+
+
+def load_sizes(path):
+    try:
+        with open(path) as sizes_file:
+            return json.load(sizes_file)
+    except (OSError, ValueError):
+        return {}
+
+
+class ResourceMonitor:
+    """
+    Count loaded and blocked requests of a browser session, per page.
+
+    Bytes saved are estimated from the sizes of the same URLs in earlier
+    unblocked runs (kept in `sizes_file`). Blocked URLs never load, so their sizes
+    only come from a calibration run: --calibrate-resource-sizes runs without
+    blocking and monitors every request. Blocked URLs without a known size count
+    0 bytes and are reported as `blocked_without_size`.
+    """
+
+    def __init__(self, driver, profile, sizes_file=DEFAULT_SIZES_FILE):
+        self.profile = profile
+        self.sizes_file = sizes_file
+        self.known_sizes = load_sizes(sizes_file)
+        self.new_sizes = {}
+        self.pages = {}
+        self.totals = {"requests_loaded": 0, "bytes_loaded": 0, "requests_blocked": 0, "bytes_saved": 0, "blocked_without_size": 0}
+        self._requests = {}
+
+        self.log = PerformanceLog.for_driver(driver)
+        # Events of a previous test on a pooled browser are not ours
+        self.log.drain()
+        self.log.subscribe(self._on_event)
+
+    def _page(self, loader_id, document_url=None):
+        page = self.pages.setdefault(loader_id, {"url": document_url, "requests": 0, "bytes": 0})
+        if document_url and not page["url"]:
+            page["url"] = document_url
+        return page
+
+    def _on_event(self, method, params):
+        if method == "Network.requestWillBeSent":
+            self._requests[params["requestId"]] = (params["request"]["url"], params.get("loaderId"))
+            self._page(params.get("loaderId"), params.get("documentURL"))
+
+        elif method == "Network.loadingFinished":
+            url, loader_id = self._requests.pop(params["requestId"], (None, None))
+            size = int(params.get("encodedDataLength", 0))
+            self.totals["requests_loaded"] += 1
+            self.totals["bytes_loaded"] += size
+            page = self._page(loader_id)
+            page["requests"] += 1
+            page["bytes"] += size
+            if url:
+                self.new_sizes[url] = size
+
+        elif method == "Network.loadingFailed":
+            url, _ = self._requests.pop(params["requestId"], (None, None))
+            blocked = params.get("blockedReason") or params.get("errorText") == "net::ERR_NAME_NOT_RESOLVED"
+            if blocked and self.profile.is_active():
+                self.totals["requests_blocked"] += 1
+                if url in self.known_sizes:
+                    self.totals["bytes_saved"] += self.known_sizes[url]
+                else:
+                    self.totals["blocked_without_size"] += 1
+
+    def budget_violations(self):
+        """Return a readable line for every page over the profile's request or byte budget"""
+        violations = []
+        for page in self.pages.values():
+            if self.profile.max_requests is not None and page["requests"] > self.profile.max_requests:
+                violations.append(f"{page['url']}: {page['requests']} requests (budget {self.profile.max_requests})")
+            if self.profile.max_bytes is not None and page["bytes"] > self.profile.max_bytes:
+                violations.append(f"{page['url']}: {page['bytes']} bytes (budget {self.profile.max_bytes})")
+        return violations
+
+    def stop(self):
+        """Stop counting, remember the sizes seen for later estimates and return the totals"""
+        self.log.drain()
+        self.log.unsubscribe(self._on_event)
+        if self.new_sizes:
+            # Parallel workers update the same file
+            with FileLock(self.sizes_file + ".lock"):
+                sizes = load_sizes(self.sizes_file)
+                sizes.update(self.new_sizes)
+                with open(self.sizes_file + ".tmp", "w") as sizes_file:
+                    json.dump(sizes, sizes_file)
+                os.replace(self.sizes_file + ".tmp", self.sizes_file)
+        return dict(self.totals)
@@ -0,0 +1,77 @@
+"""
+Browser resource governor.
+
+Between tests the governor samples the RSS and CPU time of the browser process
+tree (chromedriver and every Chrome process below it, from /proc) and:
+- records what each test added (RSS and CPU deltas) for the run report,
+- asks for the browser to be recycled once it is over the configured limits, so
+  a long run or a pooled browser cannot grow until the machine kills it.
+
+On systems without /proc it records nothing and never recycles.
+"""
+import json
+import os
+
+from utils.proc_stats import driver_usage, is_supported
+
+
+class ResourceGovernor:
+    """Per-test browser resource deltas and recycle decisions for one run"""
+
+    def __init__(self, max_rss_mb=None, max_cpu_seconds=None):
+        self.max_rss_bytes = max_rss_mb * 1_000_000 if max_rss_mb else None
+        # CPU time the browser tree may spend in total before it is replaced
+        self.max_cpu_seconds = max_cpu_seconds
+        self.enabled = is_supported()
+        self.samples = []
+
+    def start_test(self, driver):
+        """Sample the browser as the test gets it; pass the result to finish_test()"""
+        if not self.enabled:
+            return None
+        return driver_usage(driver)
+
+    def finish_test(self, driver, test_name, before):
+        """
+        Sample the browser after the test, record the deltas and return the limit
+        it went over (a readable reason), or None when it can be reused.
+        """
+        if before is None:
+            return None
+        after = driver_usage(driver)
+        if after is None:
+            return None
+
+        sample = {
+            "test": test_name,
+            "rss_bytes": after["rss_bytes"],
+            "rss_delta_bytes": after["rss_bytes"] - before["rss_bytes"],
+            "cpu_seconds": after["cpu_seconds"],
+            "cpu_delta_seconds": after["cpu_seconds"] - before["cpu_seconds"],
+            "processes": after["pids"],
+            "recycled": None,
+        }
+        if self.max_rss_bytes is not None and after["rss_bytes"] > self.max_rss_bytes:
+            sample["recycled"] = f"RSS {after['rss_bytes'] / 1_000_000:.0f} MB > {self.max_rss_bytes / 1_000_000:.0f} MB"
+        elif self.max_cpu_seconds is not None and after["cpu_seconds"] > self.max_cpu_seconds:
+            sample["recycled"] = f"CPU {after['cpu_seconds']:.0f}s > {self.max_cpu_seconds:g}s"
+        self.samples.append(sample)
+        return sample
+
+    # -------------------
+    # Reporting
+    # -------------------
+
+    def write_report(self, path):
+        """Write every test's deltas, heaviest RSS growth first, and the number of recycles"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        report = {
+            "limits": {"max_rss_bytes": self.max_rss_bytes, "max_cpu_seconds": self.max_cpu_seconds},
+            "recycles": sum(1 for sample in self.samples if sample["recycled"]),
+            "tests": sorted(self.samples, key=lambda sample: sample["rss_delta_bytes"], reverse=True),
+        }
+        with open(path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+        return report
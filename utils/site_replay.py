@@ -0,0 +1,256 @@
+"""
+Record and replay the pages the page objects touch, so scenarios can run offline.
+
+Record mode captures every response the browser receives (documents, XHR/JSON,
+scripts, styles, images, fonts) through the DevTools performance log and stores it
+under a capture directory. Replay mode serves the captures from a local HTTP server
+and rewrites absolute URLs of every captured host to that server:
+
+    https://useinsider.com/careers/    -> http://127.0.0.1:<port>/careers/
+    https://jobs.lever.co/useinsider/  -> http://127.0.0.1:<port>/_host/jobs.lever.co/useinsider/
+"""
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+from utils.command_hooks import add_command_hook, remove_command_hook
+from utils.devtools import PerformanceLog
+
+DEFAULT_CAPTURE_DIR = os.path.join("captures", "insider")
+HOST_PREFIX = "/_host/"
+# What may follow a host name in a link; anything else means a longer name (useinsider.com.tr)
+HOST_END = r"""(?=[/\\:"'?#\s]|$)"""
+
+# Commands after which the current document may be gone, so its responses are saved first
+NAVIGATING_COMMANDS = {
+    Command.GET,
+    Command.CLICK_ELEMENT,
+    Command.W3C_EXECUTE_SCRIPT,
+    Command.W3C_EXECUTE_SCRIPT_ASYNC,
+    Command.W3C_ACTIONS,
+    Command.GO_BACK,
+    Command.GO_FORWARD,
+    Command.REFRESH,
+    Command.CLOSE,
+    Command.QUIT,
+}
+TEXT_TYPES = ("text/", "application/javascript", "application/json", "application/x-javascript", "+xml", "+json")
+
+
+def _key_hash(method, url):
+    return hashlib.sha256(f"{method} {url}".encode()).hexdigest()
+
+
+def _strip_query(url):
+    return url.split("?", 1)[0]
+
+
+class SiteRecorder:
+    """Save every response of a browser session into a capture directory"""
+
+    def __init__(self, driver, capture_dir=DEFAULT_CAPTURE_DIR):
+        self.driver = driver
+        self.capture_dir = capture_dir
+        self._requests = {}
+        self._responses = {}
+        os.makedirs(os.path.join(capture_dir, "entries"), exist_ok=True)
+        os.makedirs(os.path.join(capture_dir, "bodies"), exist_ok=True)
+
+        # Large buffers keep bodies available until we read them
+        driver.execute_cdp_cmd("Network.enable", {"maxTotalBufferSize": 200_000_000, "maxResourceBufferSize": 50_000_000})
+        self.log = PerformanceLog.for_driver(driver)
+        self.log.subscribe(self._on_event)
+        add_command_hook(driver, self._before_command)
+
+    def _before_command(self, command, params, call):
+        if command in NAVIGATING_COMMANDS:
+            self.flush()
+        return call()
+
+    def _on_event(self, method, params):
+        if method == "Network.requestWillBeSent":
+            self._requests[params["requestId"]] = params["request"]
+        elif method == "Network.responseReceived":
+            self._responses[params["requestId"]] = params["response"]
+        elif method == "Network.loadingFinished":
+            self._save(params["requestId"])
+
+    def _save(self, request_id):
+        request = self._requests.pop(request_id, None)
+        response = self._responses.pop(request_id, None)
+        if request is None or response is None or not request["url"].startswith("http"):
+            return
+
+        try:
+            result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except WebDriverException:
+            return  # body already evicted, e.g. for a document we navigated away from
+        body = base64.b64decode(result["body"]) if result["base64Encoded"] else result["body"].encode()
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        body_path = os.path.join(self.capture_dir, "bodies", body_hash)
+        if not os.path.exists(body_path):
+            with open(body_path + ".tmp", "wb") as body_file:
+                body_file.write(body)
+            os.replace(body_path + ".tmp", body_path)
+
+        entry = {
+            "method": request["method"],
+            "url": request["url"],
+            "status": response["status"],
+            "content_type": response.get("mimeType", "application/octet-stream"),
+            "body": body_hash,
+        }
+        # The query-less entry answers cache-busting variants of the same resource
+        for url, overwrite in ((request["url"], True), (_strip_query(request["url"]), False)):
+            entry_path = os.path.join(self.capture_dir, "entries", _key_hash(request["method"], url) + ".json")
+            if overwrite or not os.path.exists(entry_path):
+                with open(entry_path + ".tmp", "w") as entry_file:
+                    json.dump(entry, entry_file)
+                os.replace(entry_path + ".tmp", entry_path)
+
+    def flush(self):
+        """Save the responses received since the last flush"""
+        self.log.drain()
+
+    def stop(self):
+        self.flush()
+        self.log.unsubscribe(self._on_event)
+        remove_command_hook(self.driver, self._before_command)
+
+
+class ReplayServer:
+    """Serve a capture directory on localhost in place of the live sites"""
+
+    def __init__(self, capture_dir=DEFAULT_CAPTURE_DIR, primary_host="useinsider.com", port=0):
+        self.capture_dir = capture_dir
+        self.primary_host = primary_host
+        self.hosts = self._captured_hosts()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._thread = None
+        self._rewrites = self._rewrite_patterns()
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def _captured_hosts(self):
+        hosts = set()
+        entries_dir = os.path.join(self.capture_dir, "entries")
+        if not os.path.isdir(entries_dir):
+            raise FileNotFoundError(f"No captures in {self.capture_dir}, run once with --site record")
+        for name in os.listdir(entries_dir):
+            with open(os.path.join(entries_dir, name)) as entry_file:
+                hosts.add(urlsplit(json.load(entry_file)["url"]).netloc)
+        hosts.add(self.primary_host)
+        # Longest first so 'www.useinsider.com' is rewritten before 'useinsider.com'
+        return sorted(hosts, key=len, reverse=True)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # -------------------
+    # URL Mapping
+    # -------------------
+
+    def _local_prefix(self, host):
+        if host == self.primary_host:
+            return self.base_url
+        return f"{self.base_url}{HOST_PREFIX}{host}"
+
+    def url_for(self, live_url):
+        """Return the local URL serving a live URL"""
+        parts = urlsplit(live_url)
+        local = self._local_prefix(parts.netloc) + (parts.path or "/")
+        return f"{local}?{parts.query}" if parts.query else local
+
+    def live_url(self, path, referer=None):
+        """
+        Map a request path of the local server back to the live URL it stands for.
+        A root-relative path requested by a page of another host (its Referer is
+        under /_host/<host>/) belongs to that host.
+        """
+        if path.startswith(HOST_PREFIX):
+            host, _, rest = path[len(HOST_PREFIX):].partition("/")
+            return f"https://{host}/{rest}"
+        if referer:
+            referer_path = urlsplit(referer).path
+            if referer_path.startswith(HOST_PREFIX):
+                host = referer_path[len(HOST_PREFIX):].partition("/")[0]
+                return f"https://{host}{path}"
+        return f"https://{self.primary_host}{path}"
+
+    def _rewrite_patterns(self):
+        """(pattern, local prefix) pairs for plain, JSON-escaped and protocol-relative links of every host"""
+        patterns = []
+        for host in self.hosts:
+            local = self._local_prefix(host)
+            host_pattern = re.escape(host) + HOST_END
+            patterns.append((re.compile(r"https?://" + host_pattern), local))
+            patterns.append((re.compile(r"https?:\\/\\/" + host_pattern), local.replace("/", "\\/")))
+            patterns.append((re.compile(r"//" + host_pattern), "//" + local.split("://", 1)[1]))
+        return patterns
+
+    def rewrite(self, text):
+        """Point absolute links of every captured host at the local server"""
+        for pattern, local in self._rewrites:
+            text = pattern.sub(lambda _match: local, text)
+        return text
+
+    def lookup(self, method, live_url):
+        """Return (entry, body) for a live URL, falling back to the same URL without query"""
+        for url in (live_url, _strip_query(live_url)):
+            entry_path = os.path.join(self.capture_dir, "entries", _key_hash(method, url) + ".json")
+            if os.path.exists(entry_path):
+                with open(entry_path) as entry_file:
+                    entry = json.load(entry_file)
+                with open(os.path.join(self.capture_dir, "bodies", entry["body"]), "rb") as body_file:
+                    return entry, body_file.read()
+        return None, None
+
+    def _handler_class(self):
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                entry, body = server.lookup("GET", server.live_url(self.path, self.headers.get("Referer")))
+                if entry is None:
+                    self.send_error(404, "Not captured")
+                    return
+
+                content_type = entry["content_type"]
+                if any(marker in content_type for marker in TEXT_TYPES):
+                    body = server.rewrite(body.decode("utf-8", "replace")).encode("utf-8")
+                    content_type += "; charset=utf-8"
+
+                self.send_response(entry["status"])
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "max-age=3600")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                # Analytics beacons and form posts are acknowledged and dropped
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return ReplayHandler
@@ -0,0 +1,77 @@
+"""
+Page-object steps.
+
+`@page_steps` on a page-object class turns every public method into a named step
+(e.g. "QAJobsPage.filter_location"). Step listeners are told when a step starts
+and finishes, and `current_step()` tells which step a WebDriver command belongs to.
+When no listener is registered a step costs one context-variable set and reset.
+"""
+import contextvars
+import functools
+
+_current_step = contextvars.ContextVar("page_step", default=None)
+_listeners = []
+
+
+class Step:
+    """A running page-object step"""
+
+    def __init__(self, page, name, parent):
+        self.page = page
+        self.name = name
+        self.parent = parent
+
+    @property
+    def qualified_name(self):
+        return f"{type(self.page).__name__}.{self.name}"
+
+    @property
+    def is_outermost(self):
+        return self.parent is None
+
+
+def current_step():
+    """Return the innermost running Step, or None outside page-object methods"""
+    return _current_step.get()
+
+
+def add_step_listener(listener):
+    """Register an object with step_started(step) and step_finished(step, error) methods"""
+    _listeners.append(listener)
+
+
+def remove_step_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _wrap(method):
+    @functools.wraps(method)
+    def step(self, *args, **kwargs):
+        running = Step(self, method.__name__, _current_step.get())
+        token = _current_step.set(running)
+        listeners = list(_listeners)
+        try:
+            for listener in listeners:
+                listener.step_started(running)
+            result = method(self, *args, **kwargs)
+        except BaseException as error:
+            for listener in listeners:
+                listener.step_finished(running, error)
+            raise
+        else:
+            for listener in listeners:
+                listener.step_finished(running, None)
+            return result
+        finally:
+            _current_step.reset(token)
+
+    return step
+
+
+def page_steps(cls):
+    """Class decorator: run every public method of a page object as a step"""
+    for name, attribute in list(vars(cls).items()):
+        if not name.startswith("_") and callable(attribute) and not isinstance(attribute, (staticmethod, classmethod)):
+            setattr(cls, name, _wrap(attribute))
+    return cls
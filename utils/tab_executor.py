@@ -0,0 +1,198 @@
+"""
+Concurrent journeys in the tabs of one browser.
+
+TabExecutor runs independent journeys (plain functions taking the driver) at the
+same time, each in its own tab of a single WebDriver session, driven by asyncio:
+every journey runs in a worker thread started with asyncio.to_thread and the event
+loop gathers them.
+
+A WebDriver session has one current window, so a command hook routes every
+command to the tab of the journey that sent it: commands are serialized by a lock
+and a journey's command is preceded by a window switch only when another tab was
+active. After each command the window handles are compared with the ones seen
+before, so the windows it opened are assigned to its tab. While a journey sleeps
+between the polls of a WebDriverWait (network responses, re-renders) the lock is
+free and the other tabs make progress.
+
+Per-tab isolation:
+- page objects and their WebDriverWaits are created inside the journey, so each
+  tab has its own,
+- window_handles only lists the windows of the calling tab (its own tab plus the
+  windows it opened, e.g. the Lever tab), so switch logic such as
+  window_handles[1] keeps working. A new window belongs to the tab whose
+  command made it appear, or to the tab of its opener when DevTools can tell
+  (windows opened after the command that triggered them returned),
+- cookies and storage are shared by all tabs, like in any browser profile.
+"""
+import asyncio
+import contextvars
+import threading
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+from utils.command_hooks import add_command_hook, remove_command_hook
+from utils.readiness import install_readiness_hooks
+
+_current_tab = contextvars.ContextVar("tab", default=None)
+
+
+def current_tab():
+    """The Tab of the journey running in this thread, or None outside a TabExecutor"""
+    return _current_tab.get()
+
+
+class Tab:
+    """A tab owned by one journey"""
+
+    def __init__(self, name):
+        self.name = name
+        self.handle = None
+        # The tab itself and the windows opened from it
+        self.handles = []
+
+
+class TabExecutor:
+    """Run journeys concurrently, one tab each, in a single browser"""
+
+    def __init__(self, driver, max_tabs=4):
+        self.driver = driver
+        self.max_tabs = max_tabs
+        self.tabs = []
+        self._lock = threading.RLock()
+        self._active_handle = None
+        self._home_handle = None
+        # Every window handle seen so far, to spot the windows a command opened
+        self._known_handles = set()
+
+    def run(self, journeys):
+        """
+        Run `journeys` ({"name": function(driver)}) and return {"name": result}.
+
+        Every journey runs to the end; if any failed, the first error is raised
+        afterwards (the others are printed).
+        """
+        return asyncio.run(self.run_async(journeys))
+
+    async def run_async(self, journeys):
+        self._home_handle = self._active_handle = self.driver.current_window_handle
+        self._known_handles = set(self.driver.window_handles)
+        add_command_hook(self.driver, self._route)
+        slots = asyncio.Semaphore(self.max_tabs)
+
+        async def run_journey(name, journey):
+            async with slots:
+                return await asyncio.to_thread(self._run_in_tab, Tab(name), journey)
+
+        try:
+            outcomes = await asyncio.gather(
+                *(run_journey(name, journey) for name, journey in journeys.items()),
+                return_exceptions=True,
+            )
+        finally:
+            remove_command_hook(self.driver, self._route)
+            self.driver.switch_to.window(self._home_handle)
+
+        results = dict(zip(journeys, outcomes))
+        errors = [(name, outcome) for name, outcome in results.items() if isinstance(outcome, BaseException)]
+        for name, error in errors[1:]:
+            print(f"Tab '{name}' also failed: {error!r}")
+        if errors:
+            raise errors[0][1]
+        return results
+
+    # -------------------
+    # Tab Lifecycle
+    # -------------------
+
+    def _run_in_tab(self, tab, journey):
+        """Worker thread: open the tab, run the journey in it and close it"""
+        with self._lock:
+            tab.handle = self.driver.execute(Command.NEW_WINDOW, {"type": "tab"})["value"]["handle"]
+            tab.handles.append(tab.handle)
+            self._known_handles.add(tab.handle)
+            self.tabs.append(tab)
+
+        token = _current_tab.set(tab)
+        try:
+            # A real switch, so the other command hooks (e.g. request blocking) see the new tab
+            self.driver.switch_to.window(tab.handle)
+            install_readiness_hooks(self.driver)
+            print(f"Tab '{tab.name}' started")
+            return journey(self.driver)
+        finally:
+            _current_tab.reset(token)
+            self._close(tab)
+            print(f"Tab '{tab.name}' finished")
+
+    def _close(self, tab):
+        # Imported here: the element cache keys its entries by the current Tab of this module
+        from utils.element_cache import ElementCache
+
+        with self._lock:
+            open_handles = set(self.driver.execute(Command.W3C_GET_WINDOW_HANDLES)["value"])
+            for handle in tab.handles:
+                if handle in open_handles:
+                    self.driver.execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+                    self.driver.execute(Command.CLOSE)
+            self._active_handle = None
+            self.tabs.remove(tab)
+        ElementCache.forget_tab(self.driver, tab)
+
+    # -------------------
+    # Command Routing
+    # -------------------
+
+    def _route(self, command, params, call):
+        tab = _current_tab.get()
+        if tab is None:
+            return call()
+
+        with self._lock:
+            if command == Command.SWITCH_TO_WINDOW:
+                response = call()
+                tab.handle = self._active_handle = params["handle"]
+                if tab.handle not in tab.handles:
+                    tab.handles.append(tab.handle)
+                return response
+
+            if self._active_handle != tab.handle:
+                # Issued inside a hook, so it bypasses the hooks and stays invisible to the journey
+                self.driver.execute(Command.SWITCH_TO_WINDOW, {"handle": tab.handle})
+                self._active_handle = tab.handle
+
+            response = call()
+            if command == Command.CLOSE:
+                tab.handles.remove(tab.handle)
+                self._active_handle = None
+            if command == Command.W3C_GET_WINDOW_HANDLES:
+                handles = response["value"]
+            else:
+                handles = self.driver.execute(Command.W3C_GET_WINDOW_HANDLES)["value"]
+            self._claim_new_windows(tab, handles)
+            if command == Command.W3C_GET_WINDOW_HANDLES:
+                # Hide the other tabs' windows
+                response["value"] = [handle for handle in handles if handle in tab.handles]
+            return response
+
+    def _claim_new_windows(self, tab, handles):
+        """Give the windows that appeared during `tab`'s command to the tab that opened them"""
+        new_handles = [handle for handle in handles if handle not in self._known_handles]
+        self._known_handles = set(handles)
+        if not new_handles:
+            return
+        openers = self._window_openers()
+        for handle in new_handles:
+            owner = next((other for other in self.tabs if openers.get(handle) in other.handles), tab)
+            owner.handles.append(handle)
+
+    def _window_openers(self):
+        """Window handle -> handle of the window that opened it, when the browser has CDP"""
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            return {}
+        try:
+            # chromedriver's window handles are the DevTools target ids
+            targets = self.driver.execute_cdp_cmd("Target.getTargets", {})["targetInfos"]
+        except WebDriverException:
+            return {}
+        return {target["targetId"]: target.get("openerId") for target in targets}
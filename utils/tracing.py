@@ -0,0 +1,119 @@
+"""
+Step tracing with Chrome trace-event export.
+
+A Tracer records page-object steps (begin/end) and every WebDriver round trip
+(with its duration) into a fixed-size in-memory ring buffer, using monotonic
+nanosecond timestamps. Nothing is formatted or written while the test runs;
+`export()` turns a time window of the buffer into Chrome trace-event JSON that
+opens in Perfetto (ui.perfetto.dev) or chrome://tracing, with each WebDriver
+command nested inside the step that sent it.
+
+When no tracer is attached the page objects pay only the step bookkeeping of
+utils.steps and no command hook is installed.
+"""
+import collections
+import json
+import os
+import re
+import threading
+import time
+
+from utils.command_hooks import add_command_hook, remove_command_hook
+from utils.steps import add_step_listener, remove_step_listener
+
+DEFAULT_TRACE_DIR = "traces"
+
+# Command parameters worth showing in the trace viewer; scripts and element ids are left out
+TRACED_PARAMS = ("url", "using", "value", "cmd", "handle")
+
+
+class Tracer:
+    """Ring buffer of trace events for one pytest process"""
+
+    def __init__(self, capacity=100_000):
+        # (phase, name, category, timestamp_ns, thread_id, duration_ns, args)
+        self.events = collections.deque(maxlen=capacity)
+        self._driver = None
+
+    def now(self):
+        return time.perf_counter_ns()
+
+    # -------------------
+    # Recording
+    # -------------------
+
+    def attach(self, driver):
+        """Trace the page-object steps and the WebDriver commands of `driver`"""
+        self._driver = driver
+        add_step_listener(self)
+        add_command_hook(driver, self._trace_command)
+
+    def detach(self):
+        remove_step_listener(self)
+        remove_command_hook(self._driver, self._trace_command)
+        self._driver = None
+
+    def begin(self, name, category, args=None):
+        self.events.append(("B", name, category, self.now(), threading.get_ident(), None, args))
+
+    def end(self, name, category, args=None):
+        self.events.append(("E", name, category, self.now(), threading.get_ident(), None, args))
+
+    def step_started(self, step):
+        self.begin(step.qualified_name, "step")
+
+    def step_finished(self, step, error):
+        self.end(step.qualified_name, "step", {"error": repr(error)} if error is not None else None)
+
+    def _trace_command(self, command, params, call):
+        started = self.now()
+        error = None
+        try:
+            return call()
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            args = {key: params[key] for key in TRACED_PARAMS if params and key in params}
+            if error is not None:
+                args["error"] = type(error).__name__
+            self.events.append(("X", command, "webdriver", started, threading.get_ident(), self.now() - started, args))
+
+    # -------------------
+    # Export
+    # -------------------
+
+    def export(self, path, since=None, until=None):
+        """Write the events between `since` and `until` (now() values) as Chrome trace JSON"""
+        pid = os.getpid()
+        trace_events = [
+            {"ph": "M", "name": "process_name", "pid": pid, "tid": 0, "args": {"name": "pytest"}},
+        ]
+        thread_ids = set()
+        for phase, name, category, timestamp, thread_id, duration, args in list(self.events):
+            if since is not None and timestamp < since or until is not None and timestamp > until:
+                continue
+            event = {"ph": phase, "name": name, "cat": category, "ts": timestamp / 1000, "pid": pid, "tid": thread_id}
+            if duration is not None:
+                event["dur"] = duration / 1000
+            if args:
+                event["args"] = args
+            trace_events.append(event)
+            thread_ids.add(thread_id)
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id in thread_ids:
+            trace_events.append(
+                {"ph": "M", "name": "thread_name", "pid": pid, "tid": thread_id, "args": {"name": names.get(thread_id, str(thread_id))}}
+            )
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, trace_file)
+        return path
+
+
+def trace_file_name(nodeid):
+    """tests/test_careers.py::test_x[a] -> tests_test_careers.py__test_x_a_.json"""
+    return re.sub(r"[^\w.-]", "_", nodeid.replace("::", "__")) + ".json"
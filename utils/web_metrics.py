@@ -0,0 +1,241 @@
+"""
+Web-performance metrics of the pages under test.
+
+After every navigation (driver.get) and every outermost page-object step the
+collector takes a sample of:
+- Navigation Timing of the current document (TTFB, DOMContentLoaded, load, transfer size),
+- Largest Contentful Paint, observed from document start,
+- DevTools Performance.getMetrics (JS heap, DOM nodes, layouts, script and task time);
+  layouts, style recalcs, script and task time are counted from the start of the
+  test, since a pooled browser's tab keeps its counters across tests.
+
+Samples are tagged with the test, page object and step, aggregated per
+(page, step) and written as one JSON and one CSV report per run. Optional
+thresholds fail the test whose sample went over them.
+"""
+import csv
+import json
+import os
+import statistics
+import time
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+from utils.command_hooks import add_command_hook, remove_command_hook
+from utils.steps import add_step_listener, current_step, remove_step_listener
+
+# Keeps the latest Largest Contentful Paint of the document in window.__qaLcp. Registered
+# to run at document start, so the observer is in place before the first paint; the
+# buffered flag also picks up entries from before a late (inline) installation.
+LCP_HOOK_JS = """
+if (!window.__qaLcp && window.PerformanceObserver
+        && (PerformanceObserver.supportedEntryTypes || []).includes('largest-contentful-paint')) {
+    window.__qaLcp = {value: null};
+    new PerformanceObserver((list) => {
+        const entries = list.getEntries();
+        window.__qaLcp.value = entries[entries.length - 1].startTime;
+    }).observe({type: 'largest-contentful-paint', buffered: true});
+}
+"""
+
+# Reads Navigation Timing and the LCP seen by the hook so far
+PAGE_TIMING_JS = LCP_HOOK_JS + """
+const navigation = performance.getEntriesByType('navigation')[0];
+const timing = navigation ? {
+    ttfb_ms: navigation.responseStart,
+    dom_content_loaded_ms: navigation.domContentLoadedEventEnd,
+    load_ms: navigation.loadEventEnd || null,
+    transfer_bytes: navigation.transferSize,
+} : {};
+timing.url = window.location.href;
+if (window.__qaLcp && window.__qaLcp.value !== null) {
+    timing.lcp_ms = window.__qaLcp.value;
+}
+return timing;
+"""
+
+CDP_METRICS = {
+    "JSHeapUsedSize": ("js_heap_used_mb", 1 / 1_000_000),
+    "Nodes": ("dom_nodes", 1),
+    "LayoutCount": ("layout_count", 1),
+    "RecalcStyleCount": ("recalc_style_count", 1),
+    "ScriptDuration": ("script_duration_ms", 1000),
+    "TaskDuration": ("task_duration_ms", 1000),
+}
+
+# Counters that only grow over the life of a tab; samples record what the test added
+CUMULATIVE_CDP_METRICS = {"LayoutCount", "RecalcStyleCount", "ScriptDuration", "TaskDuration"}
+
+METRIC_NAMES = [
+    "ttfb_ms",
+    "dom_content_loaded_ms",
+    "load_ms",
+    "transfer_bytes",
+    "lcp_ms",
+] + [name for name, _ in CDP_METRICS.values()]
+
+
+def parse_thresholds(values):
+    """Turn ['lcp_ms=2500', 'js_heap_used_mb=150'] into {'lcp_ms': 2500.0, ...}"""
+    thresholds = {}
+    for value in values or []:
+        name, _, limit = value.partition("=")
+        if name not in METRIC_NAMES or not limit:
+            raise ValueError(f"Bad threshold '{value}', use <metric>=<limit> with a metric from: {', '.join(METRIC_NAMES)}")
+        thresholds[name] = float(limit)
+    return thresholds
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class WebMetricsCollector:
+    """Collect samples for a whole run; attach() it to each test's driver"""
+
+    def __init__(self, thresholds=None):
+        self.thresholds = thresholds or {}
+        self.samples = []
+        self._driver = None
+        self._test = None
+        self._enabled_sessions = set()
+        self._enabled_tabs = set()
+        # Window handle -> cumulative counters when the test started
+        self._baselines = {}
+
+    # -------------------
+    # Per-test Attachment
+    # -------------------
+
+    def attach(self, driver, test_name):
+        self._driver = driver
+        self._test = test_name
+        self._baselines = {}
+        if hasattr(driver, "execute_cdp_cmd"):
+            try:
+                if driver.session_id not in self._enabled_sessions:
+                    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": LCP_HOOK_JS})
+                    self._enabled_sessions.add(driver.session_id)
+                # A pooled browser's counters include the earlier tests
+                handle = driver.current_window_handle
+                self._baselines[handle] = self._cumulative(self._cdp_metrics(driver, handle))
+            except WebDriverException:
+                pass
+        add_step_listener(self)
+        add_command_hook(driver, self._after_navigation)
+
+    def detach(self):
+        """Stop sampling and return the threshold violations of the test"""
+        remove_step_listener(self)
+        remove_command_hook(self._driver, self._after_navigation)
+        violations = self.violations(self._test)
+        self._driver = None
+        self._test = None
+        return violations
+
+    def step_started(self, step):
+        pass
+
+    def step_finished(self, step, error):
+        if error is None and step.is_outermost:
+            self.sample(step.page.driver, type(step.page).__name__, step.name)
+
+    def _after_navigation(self, command, params, call):
+        response = call()
+        # Navigations inside a page-object step are sampled when the step ends
+        if command == Command.GET and current_step() is None:
+            self.sample(self._driver, "driver", "get")
+        return response
+
+    # -------------------
+    # Sampling
+    # -------------------
+
+    def sample(self, driver, page, step):
+        """Take one sample of the current page"""
+        try:
+            metrics = driver.execute_script(PAGE_TIMING_JS)
+            if hasattr(driver, "execute_cdp_cmd"):
+                handle = driver.current_window_handle
+                # Tabs opened during the test start their counters at 0
+                baseline = self._baselines.get(handle, {})
+                for cdp_name, value in self._cdp_metrics(driver, handle).items():
+                    name, scale = CDP_METRICS[cdp_name]
+                    metrics[name] = (value - baseline.get(cdp_name, 0)) * scale
+        except WebDriverException:
+            return  # the page went away under us; skip rather than fail the test
+
+        metrics.update({"test": self._test, "page": page, "step": step, "timestamp": time.time()})
+        self.samples.append(metrics)
+
+    def _cdp_metrics(self, driver, handle):
+        """The raw Performance.getMetrics values of the current tab that we report"""
+        if (driver.session_id, handle) not in self._enabled_tabs:
+            driver.execute_cdp_cmd("Performance.enable", {})
+            self._enabled_tabs.add((driver.session_id, handle))
+        return {
+            metric["name"]: metric["value"]
+            for metric in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+            if metric["name"] in CDP_METRICS
+        }
+
+    @staticmethod
+    def _cumulative(values):
+        return {name: value for name, value in values.items() if name in CUMULATIVE_CDP_METRICS}
+
+    def violations(self, test_name):
+        """Return a readable line for every sample of a test over a threshold"""
+        violations = []
+        for sample in self.samples:
+            if sample["test"] != test_name:
+                continue
+            for name, limit in self.thresholds.items():
+                value = sample.get(name)
+                if value is not None and value > limit:
+                    violations.append(f"{sample['page']}.{sample['step']} {sample['url']}: {name}={value:.1f} > {limit:g}")
+        return violations
+
+    # -------------------
+    # Reporting
+    # -------------------
+
+    def aggregate(self):
+        """Median, p95 and max of every metric per (page, step)"""
+        groups = {}
+        for sample in self.samples:
+            groups.setdefault((sample["page"], sample["step"]), []).append(sample)
+
+        rows = []
+        for (page, step), samples in sorted(groups.items()):
+            row = {"page": page, "step": step, "samples": len(samples)}
+            for name in METRIC_NAMES:
+                values = [sample[name] for sample in samples if sample.get(name) is not None]
+                if values:
+                    row[f"{name}_median"] = statistics.median(values)
+                    row[f"{name}_p95"] = percentile(values, 0.95)
+                    row[f"{name}_max"] = max(values)
+            rows.append(row)
+        return rows
+
+    def write_report(self, path):
+        """Write <path>.json (aggregate and raw samples) and <path>.csv (aggregate)"""
+        base, _ = os.path.splitext(path)
+        rows = self.aggregate()
+        directory = os.path.dirname(base)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(base + ".json", "w") as json_file:
+            json.dump({"thresholds": self.thresholds, "aggregate": rows, "samples": self.samples}, json_file, indent=2)
+
+        columns = ["page", "step", "samples"] + [
+            f"{name}_{stat}" for name in METRIC_NAMES for stat in ("median", "p95", "max")
+        ]
+        with open(base + ".csv", "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        return base + ".json", base + ".csv"